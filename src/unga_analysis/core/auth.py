@@ -62,12 +62,12 @@ def check_rate_limit(user_id: str, max_attempts: int = 100, window: int = 60) ->
     return True
 
 
-def validate_file_upload(file_bytes: bytes, filename: str) -> bool:
-    """Validate uploaded file for security."""
+def validate_file_upload(file_size: int, filename: str) -> bool:
+    """Validate uploaded file for security, from its size and name only."""
     # Check file size (50MB limit)
     max_size = 50 * 1024 * 1024  # 50MB
-    if len(file_bytes) > max_size:
-        logger.warning(f"File too large: {len(file_bytes)} bytes")
+    if file_size > max_size:
+        logger.warning(f"File too large: {file_size} bytes")
         return False
     
     # Check file extension
@@ -2,6 +2,7 @@
 Classification logic for African Member States vs Development Partners.
 """
 
+from functools import lru_cache
 from typing import List
 
 # African Union member states (55 members)
@@ -52,6 +53,7 @@ def normalize_country_name(country: str) -> str:
     
     return country
 
+@lru_cache(maxsize=512)
 def infer_classification(country: str) -> str:
     """
     Infer classification based on country/entity name.
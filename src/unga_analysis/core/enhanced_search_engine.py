@@ -3,6 +3,7 @@ Enhanced Unified Search Engine
 Provides advanced search capabilities with proper document referencing and citations
 """
 
+import heapq
 import logging
 import re
 import json
@@ -11,6 +12,7 @@ from datetime import datetime
 from src.unga_analysis.utils.region_utils import (
     extract_regions_and_countries,
 )
+from src.unga_analysis.data.simple_vector_storage import EMBEDDING_DIMENSION
 try:
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -320,10 +322,10 @@ class EnhancedSearchEngine:
             query_embedding = self.embedding_model.encode([query])[0]
             
             # Search using vector similarity
-            results = self.db_manager.conn.execute("""
+            results = self.db_manager.conn.execute(f"""
                 SELECT id, country_code, country_name, region, session, year, 
                        speech_text, word_count, source_filename, is_african_member, created_at,
-                       array_cosine_similarity(embedding, ?) as similarity
+                       array_cosine_similarity(embedding, ?::FLOAT[{EMBEDDING_DIMENSION}]) as similarity
                 FROM speeches 
                 WHERE embedding IS NOT NULL
                 ORDER BY similarity DESC
@@ -526,6 +528,9 @@ class EnhancedSearchEngine:
         """Enhance search results with proper document references and citations."""
         enhanced_results = []
         
+        # Tokenize the query once for every result's quote scoring
+        query_words = set(query.lower().split())
+        
         for result in results:
             enhanced_result = result.copy()
             
@@ -539,7 +544,7 @@ class EnhancedSearchEngine:
             enhanced_result['context'] = self.generate_context_info(result, analysis)
             
             # Add extracted quotes that match the query
-            enhanced_result['relevant_quotes'] = self.extract_relevant_quotes(result, query)
+            enhanced_result['relevant_quotes'] = self.extract_relevant_quotes(result, query, query_words)
             
             enhanced_results.append(enhanced_result)
         
@@ -601,17 +606,20 @@ class EnhancedSearchEngine:
             'source_filename': result.get('source_filename', '')
         }
     
-    def extract_relevant_quotes(self, result: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
+    def extract_relevant_quotes(self, result: Dict[str, Any], query: str,
+                                query_words: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """Extract relevant quotes from the speech that match the query."""
         speech_text = result.get('speech_text', '')
-        if not speech_text:
+        if not speech_text or not query.strip():
             return []
         
         # Split into sentences
         sentences = re.split(r'[.!?]+', speech_text)
         
         relevant_quotes = []
-        query_words = set(query.lower().split())
+        if query_words is None:
+            query_words = set(query.lower().split())
+        citation = self.generate_citation(result)
         
         for sentence in sentences:
             sentence = sentence.strip()
@@ -630,12 +638,11 @@ class EnhancedSearchEngine:
                         'relevance_score': relevance_score,
                         'country': result.get('country_name', 'Unknown'),
                         'year': result.get('year', 'Unknown'),
-                        'citation': self.generate_citation(result)
+                        'citation': citation
                     })
         
-        # Sort by relevance and return top quotes
-        relevant_quotes.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return relevant_quotes[:5]  # Return top 5 relevant quotes
+        # Partial top-k selection instead of sorting every candidate sentence
+        return heapq.nlargest(5, relevant_quotes, key=lambda x: x['relevance_score'])
 
 
 # Global enhanced search engine instance
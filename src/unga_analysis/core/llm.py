@@ -4,7 +4,7 @@ OpenAI API integration with retry logic and error handling.
 
 import time
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from openai import AzureOpenAI
 import openai
 import tiktoken
@@ -51,48 +51,35 @@ def validate_token_limits(system_message: str, user_message: str,
     total_tokens = count_tokens(system_message + user_message, model)
     return total_tokens <= max_input_tokens
 
-def run_analysis(system_msg: str, user_msg: str, model: str = "gpt-4o", 
-                client: Optional[AzureOpenAI] = None, max_retries: int = 3) -> str:
+def _create_chat_completion(client: AzureOpenAI, model: str, messages: list,
+                            max_retries: int = 3, stream: bool = False) -> Any:
     """
-    Run analysis using Azure OpenAI Chat Completions API with retry logic.
+    Call the Chat Completions API with retry logic.
     
     Args:
-        system_msg: System message
-        user_msg: User message
-        model: Model to use (default: gpt-4o)
         client: Azure OpenAI client instance
+        model: Model to use
+        messages: Chat messages to send
         max_retries: Maximum number of retry attempts
+        stream: Whether to request a streamed response
         
     Returns:
-        Generated response text
+        Completion response, or a chunk iterator when streaming
         
     Raises:
         OpenAIError: If API call fails after all retries
     """
-    if not client:
-        raise ValueError("Azure OpenAI client is required")
-    
-    # Validate token limits
-    if not validate_token_limits(system_msg, user_msg, model):
-        raise OpenAIError("Input exceeds token limits for the selected model")
-    
-    messages = [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg}
-    ]
-    
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
+            return client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=0.1,  # Low temperature for consistent output
                 max_tokens=6000,  # Increased limit for comprehensive analysis output
-                top_p=0.9
+                top_p=0.9,
+                stream=stream
             )
             
-            return response.choices[0].message.content.strip()
-            
         except openai.RateLimitError as e:
             wait_time = 2 ** attempt  # Exponential backoff
             logger.warning(f"Rate limit exceeded, waiting {wait_time}s before retry {attempt + 1}")
@@ -133,6 +120,78 @@ def run_analysis(system_msg: str, user_msg: str, model: str = "gpt-4o",
             else:
                 raise OpenAIError(f"Unexpected error after {max_retries} attempts: {e}")
 
+def run_analysis(system_msg: str, user_msg: str, model: str = "gpt-4o", 
+                client: Optional[AzureOpenAI] = None, max_retries: int = 3) -> str:
+    """
+    Run analysis using Azure OpenAI Chat Completions API with retry logic.
+    
+    Args:
+        system_msg: System message
+        user_msg: User message
+        model: Model to use (default: gpt-4o)
+        client: Azure OpenAI client instance
+        max_retries: Maximum number of retry attempts
+        
+    Returns:
+        Generated response text
+        
+    Raises:
+        OpenAIError: If API call fails after all retries
+    """
+    if not client:
+        raise ValueError("Azure OpenAI client is required")
+    
+    # Validate token limits
+    if not validate_token_limits(system_msg, user_msg, model):
+        raise OpenAIError("Input exceeds token limits for the selected model")
+    
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_msg}
+    ]
+    
+    response = _create_chat_completion(client, model, messages, max_retries)
+    return response.choices[0].message.content.strip()
+
+def run_analysis_stream(system_msg: str, user_msg: str, model: str = "gpt-4o",
+                        client: Optional[AzureOpenAI] = None, max_retries: int = 3) -> Iterator[str]:
+    """
+    Stream an analysis from the Azure OpenAI Chat Completions API.
+    
+    Retries apply to opening the stream; once tokens start arriving they
+    are yielded as-is, so the result can be passed to ``st.write_stream``.
+    
+    Args:
+        system_msg: System message
+        user_msg: User message
+        model: Model to use (default: gpt-4o)
+        client: Azure OpenAI client instance
+        max_retries: Maximum number of retry attempts
+        
+    Yields:
+        Response text deltas
+        
+    Raises:
+        OpenAIError: If API call fails after all retries
+    """
+    if not client:
+        raise ValueError("Azure OpenAI client is required")
+    
+    # Validate token limits
+    if not validate_token_limits(system_msg, user_msg, model):
+        raise OpenAIError("Input exceeds token limits for the selected model")
+    
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_msg}
+    ]
+    
+    stream = _create_chat_completion(client, model, messages, max_retries, stream=True)
+    for chunk in stream:
+        # Azure may send chunks without choices (e.g. content filter results)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
 def chunk_and_synthesize(system_msg: str, user_msg: str, model: str = "gpt-4o",
                         client: Optional[AzureOpenAI] = None, max_chunk_size: int = 20000) -> str:
     """
@@ -3,12 +3,22 @@ OpenAI Client Module
 Handles Azure OpenAI client creation and configuration
 """
 
+import atexit
 import os
 import streamlit as st
 from typing import Optional
 from openai import AzureOpenAI
 
 
+@st.cache_resource(show_spinner=False)
+def _create_client(api_key: str, azure_endpoint: str, api_version: str) -> AzureOpenAI:
+    """Create one shared client per configuration, reused across reruns and sessions."""
+    client = AzureOpenAI(api_key=api_key, azure_endpoint=azure_endpoint, api_version=api_version)
+    # Release pooled connections when the server shuts down
+    atexit.register(client.close)
+    return client
+
+
 def get_openai_client() -> Optional[AzureOpenAI]:
     """Get Azure OpenAI client for Chat Completions API (Analysis)."""
     api_key = os.getenv('AZURE_OPENAI_API_KEY')
@@ -19,7 +29,7 @@ def get_openai_client() -> Optional[AzureOpenAI]:
         st.error("Azure OpenAI credentials not configured")
         return None
     
-    return AzureOpenAI(api_key=api_key, azure_endpoint=azure_endpoint, api_version=api_version)
+    return _create_client(api_key, azure_endpoint, api_version)
 
 
 def get_whisper_client() -> Optional[AzureOpenAI]:
@@ -32,4 +42,4 @@ def get_whisper_client() -> Optional[AzureOpenAI]:
         st.error("Whisper API credentials not configured")
         return None
     
-    return AzureOpenAI(api_key=api_key, azure_endpoint=azure_endpoint, api_version=api_version)
+    return _create_client(api_key, azure_endpoint, api_version)
@@ -7,7 +7,10 @@ import os
 import csv
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 import re
 
@@ -16,6 +19,17 @@ from ..core.classify import get_au_members
 
 logger = logging.getLogger(__name__)
 
+# Concurrent translation requests and rate-limit retries per chunk
+TRANSLATION_MAX_WORKERS = 5
+TRANSLATION_MAX_RETRIES = 5
+# Largest chunk sent to the translator (Google Translate accepts up to 5000 chars)
+TRANSLATION_CHUNK_SIZE = 4500
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Words that together all but guarantee an English sample
+_ENGLISH_MARKERS = (' the ', ' and ', ' of ')
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 COUNTRY_CLASSIFICATIONS_PATH = PROJECT_ROOT / "artifacts" / "Country classifications.csv"
 
@@ -53,14 +67,26 @@ _EXTENDED_REGION_GROUPINGS: Dict[str, List[str]] = {}
 
 def get_additional_region_groupings_for_code(country_code: str) -> List[str]:
     """Return additional region groupings for the provided ISO3 code."""
+    return list(_additional_region_groupings_for_code(country_code))
+
+
+@lru_cache(maxsize=512)
+def _additional_region_groupings_for_code(country_code: str) -> Tuple[str, ...]:
+    """Memoized additional groupings; a tuple so callers can't mutate the cached value."""
     if not country_code:
-        return []
+        return ()
     groupings = _load_extended_region_groupings()
-    return groupings.get(country_code.upper(), [])
+    return tuple(groupings.get(country_code.upper(), ()))
 
 
 def get_regions_for_code(country_code: str, include_additional: bool = True) -> List[str]:
     """Get ordered list of regions (primary + optional additional) for a country code."""
+    return list(_regions_for_code(country_code, include_additional))
+
+
+@lru_cache(maxsize=512)
+def _regions_for_code(country_code: str, include_additional: bool) -> Tuple[str, ...]:
+    """Memoized region lookup; a tuple so callers can't mutate the cached value."""
     code = (country_code or "").upper()
     regions: List[str] = []
 
@@ -69,11 +95,11 @@ def get_regions_for_code(country_code: str, include_additional: bool = True) ->
         regions.append(primary_region)
 
     if include_additional:
-        for region in get_additional_region_groupings_for_code(code):
+        for region in _additional_region_groupings_for_code(code):
             if region and region not in regions:
                 regions.append(region)
 
-    return regions
+    return tuple(regions)
 
 
 def get_country_region_lookup(include_primary: bool = True, include_additional: bool = True) -> Dict[str, List[str]]:
@@ -89,7 +115,7 @@ def get_country_region_lookup(include_primary: bool = True, include_additional:
                 region_list.append(primary_region)
 
         if include_additional:
-            for region in get_additional_region_groupings_for_code(code):
+            for region in _additional_region_groupings_for_code(code):
                 if region and region not in region_list:
                     region_list.append(region)
 
@@ -115,10 +141,12 @@ def get_all_region_labels(include_primary: bool = True, include_additional: bool
 try:
     from langdetect import detect, DetectorFactory
     from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import TooManyRequests
     DetectorFactory.seed = 0  # For consistent results
     LANG_DETECTION_AVAILABLE = True
 except ImportError:
     LANG_DETECTION_AVAILABLE = False
+    TooManyRequests = None
     logger.warning("Language detection libraries not available. Install langdetect and deep-translator for automatic translation.")
 
 # Country code to full name mapping
@@ -175,6 +203,9 @@ COUNTRY_CODE_MAPPING = {
     'YEM': 'Yemen', 'ZMB': 'Zambia', 'ZWE': 'Zimbabwe'
 }
 
+# Reverse lookup: full country name to country code
+NAME_TO_CODE = {name: code for code, name in COUNTRY_CODE_MAPPING.items()}
+
 # Region mapping for countries
 REGION_MAPPING = {
     # Africa
@@ -325,12 +356,121 @@ def _load_extended_region_groupings() -> Dict[str, List[str]]:
     return _EXTENDED_REGION_GROUPINGS
 
 
+
+def is_probably_english(text: str, sample_size: int = 2048) -> bool:
+    """
+    Cheap check for plainly English text, used to skip language detection.
+    
+    The sample must be at least 95% ASCII and contain all of a few very
+    common English function words; anything else is left to langdetect.
+    """
+    sample = text[:sample_size]
+    if not sample:
+        return False
+    ascii_count = len(sample.encode('ascii', 'ignore'))
+    if ascii_count / len(sample) < 0.95:
+        return False
+    lowered = sample.lower()
+    return all(marker in lowered for marker in _ENGLISH_MARKERS)
+
+def split_into_translation_chunks(text: str, max_chunk_size: int = TRANSLATION_CHUNK_SIZE) -> List[str]:
+    """
+    Split text into chunks of at most max_chunk_size characters without
+    breaking sentences.
+    
+    Sentences are packed greedily; a single sentence longer than the limit is
+    the only case that gets hard-sliced.
+    
+    Args:
+        text: Text to split
+        max_chunk_size: Maximum size of each chunk (in characters)
+        
+    Returns:
+        List of text chunks
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        if not sentence:
+            continue
+        # Account for the space that joins it to the previous sentence
+        added_size = len(sentence) + (1 if current else 0)
+        if current and current_size + added_size > max_chunk_size:
+            chunks.append(' '.join(current))
+            current, current_size = [], 0
+            added_size = len(sentence)
+        
+        if added_size > max_chunk_size:
+            chunks.extend(sentence[i:i + max_chunk_size] for i in range(0, len(sentence), max_chunk_size))
+            continue
+        
+        current.append(sentence)
+        current_size += added_size
+    
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+def prewarm_language_detection() -> None:
+    """Load langdetect's language profiles ahead of the first detection."""
+    if not LANG_DETECTION_AVAILABLE:
+        return
+    try:
+        # The first detect() call loads all language profiles from disk
+        detect("This warms up the language detector.")
+    except Exception as e:
+        logger.warning(f"Language detection prewarm failed: {e}")
+
+def _translate_chunk(chunk: str, source_lang: str) -> str:
+    """Translate one chunk to English, backing off exponentially when rate limited."""
+    translator = GoogleTranslator(source=source_lang, target='en')
+    for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+        try:
+            return translator.translate(chunk)
+        except TooManyRequests:
+            if attempt == TRANSLATION_MAX_RETRIES:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def translate_chunks(chunks: List[str], source_lang: str,
+                     on_progress: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """
+    Translate text chunks to English concurrently.
+    
+    Requests are bounded to TRANSLATION_MAX_WORKERS in flight, so translation
+    takes roughly one round-trip per batch instead of one per chunk.
+    
+    Args:
+        chunks: Text chunks, each within the translator's size limit
+        source_lang: Source language code
+        on_progress: Optional callback receiving (completed, total); it is
+            invoked on the calling thread
+        
+    Returns:
+        Translated chunks in their original order
+    """
+    translated: List[Optional[str]] = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=min(TRANSLATION_MAX_WORKERS, len(chunks) or 1)) as executor:
+        futures = {
+            executor.submit(_translate_chunk, chunk, source_lang): index
+            for index, chunk in enumerate(chunks)
+        }
+        for completed, future in enumerate(as_completed(futures), 1):
+            translated[futures[future]] = future.result()
+            if on_progress:
+                on_progress(completed, len(chunks))
+    return translated
+
 class DataIngestionManager:
     """Manages data ingestion for UNGA speech data."""
     
     def __init__(self):
         self.db_manager = db_manager
         self.au_members = get_au_members()
+        self._au_member_set = frozenset(self.au_members)
         self.extended_region_groupings = _load_extended_region_groupings()
     
     def get_country_name_from_code(self, country_code: str) -> str:
@@ -436,7 +576,7 @@ class DataIngestionManager:
     
     def is_african_member(self, country_name: str) -> bool:
         """Check if country is an African Union member."""
-        return country_name in self.au_members
+        return country_name in self._au_member_set
     
     def parse_filename(self, filename: str) -> Optional[Tuple[str, int, int]]:
         """
@@ -477,6 +617,9 @@ class DataIngestionManager:
         if not LANG_DETECTION_AVAILABLE or not text.strip():
             return 'unknown'
         
+        if is_probably_english(text):
+            return 'en'
+        
         try:
             # Use first 1000 characters for detection (faster and more reliable)
             sample_text = text[:1000] if len(text) > 1000 else text
@@ -512,22 +655,13 @@ class DataIngestionManager:
                 return text, source_lang
             
             # Translate to English using deep-translator
-            translator = GoogleTranslator(source=source_lang, target='en')
             # Translate in chunks to handle long texts
-            max_chunk_size = 4000  # Google Translate limit
-            
-            if len(text) <= max_chunk_size:
-                translated_text = translator.translate(text)
+            if len(text) <= TRANSLATION_CHUNK_SIZE:
+                translated_text = _translate_chunk(text, source_lang)
             else:
-                # Split into chunks and translate each
-                chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-                translated_chunks = []
-                
-                for chunk in chunks:
-                    translated_chunk = translator.translate(chunk)
-                    translated_chunks.append(translated_chunk)
-                
-                translated_text = ' '.join(translated_chunks)
+                # Split on sentence boundaries and translate the chunks concurrently
+                chunks = split_into_translation_chunks(text)
+                translated_text = ' '.join(translate_chunks(chunks, source_lang))
             
             logger.info(f"Translated text from {source_lang} to English ({len(text)} -> {len(translated_text)} chars)")
             return translated_text, source_lang
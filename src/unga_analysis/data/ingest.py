@@ -13,6 +13,11 @@ from pdfminer.pdfpage import PDFPage
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
 import docx
+try:
+    # PyMuPDF parses PDFs in C and is much faster than pypdf/pdfminer
+    import fitz
+except ImportError:
+    fitz = None
 try:
     import pydub
     from pydub import AudioSegment
@@ -27,7 +32,8 @@ logger = logging.getLogger(__name__)
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """
     Extract text from PDF file bytes.
-    First tries pypdf, falls back to pdfminer.six if pages return empty.
+    Uses PyMuPDF when installed, otherwise pypdf, and falls back to
+    pdfminer.six if pages return empty.
     
     Args:
         file_bytes: PDF file as bytes
@@ -35,8 +41,25 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     Returns:
         Extracted text as string
     """
+    if fitz is not None:
+        try:
+            with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+                text_parts = []
+                for page in doc:
+                    page_text = page.get_text("text")
+                    if page_text.strip():  # Only add non-empty pages
+                        text_parts.append(page_text)
+            
+            if text_parts:
+                return "\n\n".join(text_parts)
+            
+            logger.warning("PyMuPDF extracted no text, trying pypdf")
+            
+        except Exception as e:
+            logger.warning(f"PyMuPDF failed: {e}, trying pypdf")
+    
     try:
-        # Try pypdf first
+        # Try pypdf
         pdf_file = io.BytesIO(file_bytes)
         reader = PdfReader(pdf_file)
         
@@ -3,9 +3,14 @@ Advanced Vector Storage System using DuckDB with Embeddings
 Full implementation with vector similarity search and semantic analysis
 """
 
+import atexit
 import os
 import logging
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 import numpy as np
@@ -24,6 +29,38 @@ except (ImportError, Exception) as e:
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of query embeddings kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = 256
+# Text beyond this length is not used when embedding
+EMBEDDING_TEXT_LIMIT = 5000
+# Dimension of the stored speech embeddings (all-MiniLM-L6-v2)
+EMBEDDING_DIMENSION = 384
+# Rank offset used by reciprocal rank fusion in hybrid_search
+RRF_K = 60
+
+
+def duckdb_config() -> Dict[str, str]:
+    """
+    Connection settings for the speech database.
+    
+    DuckDB keeps hot blocks in its own buffer pool (always write-ahead logged),
+    so the knobs that matter are the pool size and worker threads. They can be
+    tuned per deployment with UNGA_DB_MEMORY_LIMIT (e.g. "2GB") and UNGA_DB_THREADS.
+    """
+    config = {}
+    memory_limit = os.getenv('UNGA_DB_MEMORY_LIMIT')
+    if memory_limit:
+        config['memory_limit'] = memory_limit
+    threads = os.getenv('UNGA_DB_THREADS')
+    if threads:
+        config['threads'] = threads
+    return config
+
+
+def text_sha256(text: str) -> str:
+    """SHA-256 of whitespace-trimmed text, used to recognise duplicate speeches."""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
 class SimpleVectorStorageManager:
     """Advanced vector storage manager using DuckDB with embeddings."""
     
@@ -31,7 +68,29 @@ class SimpleVectorStorageManager:
         self.db_path = db_path
         
         # Initialize DuckDB connection
-        self.conn = duckdb.connect(db_path)
+        self.conn = duckdb.connect(db_path, config=duckdb_config())
+        
+        # (row count, max id) of speeches when the full-text index was last built
+        self._fts_signature = None
+        self._fts_unavailable = False
+        
+        # LRU of query embeddings keyed by SHA-256 of the embedded text
+        self._query_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Sessions and the background embedding thread share the cache
+        self._query_embedding_lock = threading.Lock()
+        
+        # Every session thread shares this connection, so writes are serialised
+        # and a transaction() holds the lock until it commits or rolls back
+        self._write_lock = threading.RLock()
+        # Per-thread flag set while transaction() is active so saves don't commit
+        self._transaction_state = threading.local()
+        
+        self._init_embedding_model()
+        
+        # Create missing tables and bring existing databases up to the current schema
+        self._create_tables()
+        
+        logger.info("Advanced vector storage initialized with embeddings")
     
     def reconnect(self):
         """Force reconnect to database to see latest changes."""
@@ -41,12 +100,18 @@ class SimpleVectorStorageManager:
         except:
             pass
         # Create completely fresh connection
-        self.conn = duckdb.connect(self.db_path)
-        # Force read from disk by running a query
-        _ = self.conn.execute("SELECT COUNT(*) FROM speeches WHERE region IS NOT NULL").fetchone()
+        self.conn = duckdb.connect(self.db_path, config=duckdb_config())
+        self._fts_signature = None
+        # Force read from disk by running a query; stopping at the first row
+        # is enough, a full count would scan the whole table
+        _ = self.conn.execute("SELECT 1 FROM speeches WHERE region IS NOT NULL LIMIT 1").fetchone()
         logger.info(f"Reconnected to database: {self.db_path}")
         
-        # Initialize sentence transformer for embeddings
+        # Functions registered with create_function belong to the old connection
+        self._create_tables()
+    
+    def _init_embedding_model(self):
+        """Load the sentence transformer, or fall back to hash embeddings."""
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
                 self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
@@ -65,11 +130,6 @@ class SimpleVectorStorageManager:
             self.embedding_dimension = 384
             self.embeddings_enabled = False
             logger.info("Embeddings disabled - sentence-transformers not available")
-        
-        # Create tables
-        self._create_tables()
-        
-        logger.info("Advanced vector storage initialized with embeddings")
     
     def _create_tables(self):
         """Create optimized tables for vector storage."""
@@ -118,12 +178,43 @@ class SimpleVectorStorageManager:
         except:
             pass  # Column already exists or ALTER COLUMN IF NOT EXISTS not supported
         
+        # Content hash used to skip re-processing an identical upload
+        try:
+            self.conn.execute("ALTER TABLE speeches ADD COLUMN IF NOT EXISTS text_sha256 VARCHAR(64)")
+            # Backfill rows stored before the column existed
+            self._backfill_text_hashes('speeches', 'speech_text')
+        except Exception as e:
+            logger.warning(f"Could not add text_sha256 column: {e}")
+        
+        # Model and text hash let an identical analysis request reuse a stored result
+        try:
+            self.conn.execute("ALTER TABLE analyses ADD COLUMN IF NOT EXISTS model VARCHAR")
+            self.conn.execute("ALTER TABLE analyses ADD COLUMN IF NOT EXISTS text_sha256 VARCHAR(64)")
+            self.conn.execute("""
+                UPDATE analyses
+                SET model = json_extract_string(metadata, '$.model')
+                WHERE model IS NULL AND text_sha256 IS NULL
+            """)
+            self._backfill_text_hashes('analyses', 'raw_text')
+        except Exception as e:
+            logger.warning(f"Could not add analysis dedup columns: {e}")
+        
         # Create indexes for performance
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_speeches_country_name ON speeches(country_name)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_speeches_year ON speeches(year)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_speeches_text_sha256 ON speeches(text_sha256)")
+        # Composite index for the per-(country, year) existence check in the new analysis tab
+        composite_exists = self.conn.execute(
+            "SELECT 1 FROM duckdb_indexes() WHERE index_name = 'idx_speeches_country_year'"
+        ).fetchone()
+        if not composite_exists:
+            self.conn.execute("CREATE INDEX idx_speeches_country_year ON speeches(country_name, year)")
+            # Refresh planner statistics once, when the index is first added
+            self.conn.execute("ANALYZE")
         # Note: region column doesn't exist in current database schema
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_country ON analyses(country)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_classification ON analyses(classification)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_dedup ON analyses(text_sha256, model, classification)")
 
         # Region groupings table for extended classifications
         self.conn.execute(
@@ -158,6 +249,104 @@ class SimpleVectorStorageManager:
         
         logger.info("Database tables and indexes created successfully")
     
+    def _backfill_text_hashes(self, table: str, text_column: str, batch_size: int = 1000):
+        """
+        Fill text_sha256 for rows saved before the column existed.
+        
+        Hashes are computed with text_sha256() so they match what new saves
+        store; SQL trimming does not strip the same whitespace as str.strip().
+        """
+        cursor = self.conn.execute(
+            f"SELECT id, {text_column} FROM {table} "
+            f"WHERE text_sha256 IS NULL AND {text_column} IS NOT NULL"
+        )
+        hashes = []
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            hashes.extend((row_id, text_sha256(text)) for row_id, text in rows)
+        if not hashes:
+            return
+        
+        self.conn.register('_text_hashes', pd.DataFrame(hashes, columns=['id', 'text_sha256']))
+        try:
+            self.conn.execute(f"""
+                UPDATE {table}
+                SET text_sha256 = _text_hashes.text_sha256
+                FROM _text_hashes
+                WHERE {table}.id = _text_hashes.id
+            """)
+        finally:
+            self.conn.unregister('_text_hashes')
+        logger.info(f"Backfilled text_sha256 for {len(hashes)} rows in {table}")
+    
+    @property
+    def _in_transaction(self) -> bool:
+        """Whether the calling thread is inside a transaction() block."""
+        return getattr(self._transaction_state, 'active', False)
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into a single transaction and commit.
+        
+        Saves made inside the block skip their own commit; everything is
+        committed on exit or rolled back if the block raises. Nested use
+        joins the outer transaction. Writes from other threads wait until
+        the block ends instead of joining it.
+        """
+        if self._in_transaction:
+            yield
+            return
+        
+        with self._write_lock:
+            self.conn.execute("BEGIN TRANSACTION")
+            self._transaction_state.active = True
+            try:
+                yield
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self._transaction_state.active = False
+    
+    def _commit(self):
+        """Commit unless a transaction() block will commit for us."""
+        if not self._in_transaction:
+            self.conn.commit()
+    
+    def ensure_fts_index(self) -> bool:
+        """Build or refresh the DuckDB full-text (BM25) index over speech_text.
+        
+        The index is rebuilt only when the speeches table has changed since the
+        last build. Returns False when the fts extension is unavailable, in
+        which case callers should fall back to ILIKE matching.
+        """
+        if self._fts_unavailable:
+            return False
+        
+        try:
+            signature = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM speeches"
+            ).fetchone()
+            signature = tuple(signature)
+            if signature == self._fts_signature:
+                return True
+            
+            self.conn.execute("INSTALL fts")
+            self.conn.execute("LOAD fts")
+            self.conn.execute("PRAGMA create_fts_index('speeches', 'id', 'speech_text', overwrite=1)")
+            self._fts_signature = signature
+            logger.info("Full-text index built over %s speeches", signature[0])
+            return True
+        except Exception as e:
+            # Don't retry the extension install on every query
+            logger.warning(f"Full-text index not available: {e}")
+            self._fts_unavailable = True
+            return False
+    
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         try:
@@ -189,8 +378,8 @@ class SimpleVectorStorageManager:
                 return self._generate_hash_embedding(text)
             
             # Clean and truncate text if too long
-            if len(text) > 5000:  # Limit text length for embedding
-                text = text[:5000]
+            if len(text) > EMBEDDING_TEXT_LIMIT:  # Limit text length for embedding
+                text = text[:EMBEDDING_TEXT_LIMIT]
             
             embedding = self.embedding_model.encode(text, convert_to_tensor=False)
             return embedding.tolist()
@@ -198,6 +387,25 @@ class SimpleVectorStorageManager:
             logger.error(f"Failed to generate embedding: {e}")
             return self._generate_hash_embedding(text)
     
+    def get_query_embedding(self, text: str) -> List[float]:
+        """Generate an embedding for a search query, reusing recent results."""
+        key = hashlib.sha256(text[:EMBEDDING_TEXT_LIMIT].encode()).hexdigest()
+        
+        with self._query_embedding_lock:
+            cached = self._query_embedding_cache.get(key)
+            if cached is not None:
+                self._query_embedding_cache.move_to_end(key)
+                return cached
+        
+        # Embed outside the lock so other lookups are not held up by the model
+        embedding = self.generate_embedding(text)
+        with self._query_embedding_lock:
+            self._query_embedding_cache[key] = embedding
+            self._query_embedding_cache.move_to_end(key)
+            while len(self._query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embedding_cache.popitem(last=False)
+        return embedding
+    
     def _generate_hash_embedding(self, text: str) -> List[float]:
         """Generate a simple hash-based embedding as fallback."""
         import hashlib
@@ -222,11 +430,18 @@ class SimpleVectorStorageManager:
     def save_speech(self, country_code: str, country_name: str, region: str, 
                    session: int, year: int, speech_text: str, 
                    source_filename: str = None, is_african_member: bool = False,
-                   metadata: Dict = None) -> int:
-        """Save speech to database with embedding."""
+                   metadata: Dict = None, content_hash: str = None,
+                   word_count: int = None) -> int:
+        """Save speech to database with embedding.
+        
+        ``content_hash`` defaults to ``text_sha256(speech_text)``; pass the hash
+        of the original upload when the stored text is a translation.
+        ``word_count`` may be passed when the caller has already counted.
+        """
         try:
-            # Calculate word count
-            word_count = len(speech_text.split()) if speech_text else 0
+            # Calculate word count unless the caller already has it
+            if word_count is None:
+                word_count = len(speech_text.split()) if speech_text else 0
             
             # Generate embedding
             embedding = self.generate_embedding(speech_text)
@@ -234,21 +449,23 @@ class SimpleVectorStorageManager:
             # Prepare metadata
             metadata_json = json.dumps(metadata or {})
             
-            # Get next ID
-            max_id_result = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM speeches").fetchone()
-            speech_id = max_id_result[0]
+            with self._write_lock:
+                # Get next ID
+                max_id_result = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM speeches").fetchone()
+                speech_id = max_id_result[0]
             
-            # Insert into database with embedding
-            self.conn.execute("""
-                INSERT INTO speeches 
-                (id, country_code, country_name, region, session, year, speech_text, 
-                 word_count, embedding, metadata, is_african_member, source_filename)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [speech_id, country_code, country_name, region, session, year, speech_text,
-                  word_count, embedding, metadata_json, is_african_member, source_filename])
-            
-            # Commit the transaction
-            self.conn.commit()
+                # Insert into database with embedding
+                self.conn.execute("""
+                    INSERT INTO speeches 
+                    (id, country_code, country_name, region, session, year, speech_text, 
+                     word_count, embedding, metadata, is_african_member, source_filename, text_sha256)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [speech_id, country_code, country_name, region, session, year, speech_text,
+                      word_count, embedding, metadata_json, is_african_member, source_filename,
+                      content_hash or text_sha256(speech_text)])
+            
+                # Commit the transaction
+                self._commit()
             
             logger.info(f"Saved speech {speech_id} for {country_name} ({country_code}) with embedding")
             return speech_id
@@ -261,29 +478,36 @@ class SimpleVectorStorageManager:
                      output_markdown: str, prompt_used: str, sdgs: List[int] = None,
                      africa_mentioned: bool = False, speech_date: str = None,
                      source_filename: str = None, metadata: Dict = None,
-                     chat_history: List[Dict] = None) -> int:
+                     chat_history: List[Dict] = None, model: str = None,
+                     content_hash: str = None) -> int:
         """Save analysis to database with chat history."""
         try:
             # Prepare data
             sdgs_str = ",".join(map(str, sdgs)) if sdgs else None
             metadata_json = json.dumps(metadata or {})
             chat_history_json = json.dumps(chat_history or [])
-            
-            # Get next ID
-            max_id_result = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM analyses").fetchone()
-            analysis_id = max_id_result[0]
-            
-            # Insert into database
-            self.conn.execute("""
-                INSERT INTO analyses 
-                (id, country, classification, speech_date, sdgs, africa_mentioned, 
-                 source_filename, raw_text, prompt_used, output_markdown, metadata, chat_history)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [analysis_id, country, classification, speech_date, sdgs_str, africa_mentioned,
-                  source_filename, raw_text, prompt_used, output_markdown, metadata_json, chat_history_json])
-            
-            # Commit the transaction
-            self.conn.commit()
+            model = model or (metadata or {}).get('model')
+            if content_hash is None and raw_text:
+                content_hash = text_sha256(raw_text)
+            
+            with self._write_lock:
+                # Get next ID
+                max_id_result = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM analyses").fetchone()
+                analysis_id = max_id_result[0]
+            
+                # Insert into database
+                self.conn.execute("""
+                    INSERT INTO analyses 
+                    (id, country, classification, speech_date, sdgs, africa_mentioned, 
+                     source_filename, raw_text, prompt_used, output_markdown, metadata, chat_history,
+                     model, text_sha256)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [analysis_id, country, classification, speech_date, sdgs_str, africa_mentioned,
+                      source_filename, raw_text, prompt_used, output_markdown, metadata_json, chat_history_json,
+                      model, content_hash])
+            
+                # Commit the transaction
+                self._commit()
             
             logger.info(f"Saved analysis {analysis_id} for {country}")
             return analysis_id
@@ -297,14 +521,15 @@ class SimpleVectorStorageManager:
         try:
             chat_history_json = json.dumps(chat_history)
             
-            self.conn.execute("""
-                UPDATE analyses 
-                SET chat_history = ?
-                WHERE id = ?
-            """, [chat_history_json, analysis_id])
+            with self._write_lock:
+                self.conn.execute("""
+                    UPDATE analyses 
+                    SET chat_history = ?
+                    WHERE id = ?
+                """, [chat_history_json, analysis_id])
             
-            # Commit the transaction
-            self.conn.commit()
+                # Commit the transaction
+                self._commit()
             
             logger.info(f"Updated chat history for analysis {analysis_id}")
             return True
@@ -318,13 +543,14 @@ class SimpleVectorStorageManager:
         try:
             metadata_json = json.dumps(metadata or {})
             
-            self.conn.execute("""
-                UPDATE speeches
-                SET metadata = ?
-                WHERE id = ?
-            """, [metadata_json, speech_id])
+            with self._write_lock:
+                self.conn.execute("""
+                    UPDATE speeches
+                    SET metadata = ?
+                    WHERE id = ?
+                """, [metadata_json, speech_id])
             
-            self.conn.commit()
+                self._commit()
             logger.info(f"Updated metadata for speech {speech_id}")
             return True
         except Exception as e:
@@ -420,12 +646,19 @@ class SimpleVectorStorageManager:
     
     def semantic_search(self, query_text: str, limit: int = 10, 
                        countries: List[str] = None, years: List[int] = None, 
-                       regions: List[str] = None, similarity_threshold: float = 0.7) -> List[Dict[str, Any]]:
-        """Perform semantic search using vector similarity."""
+                       regions: List[str] = None, similarity_threshold: float = 0.7,
+                       year_min: int = None, year_max: int = None) -> List[Dict[str, Any]]:
+        """Perform semantic search using vector similarity.
+        
+        ``year_min``/``year_max`` bound the year range inside the query, so the
+        ``limit`` most similar speeches are all within range.
+        """
         try:
             if not self.embeddings_enabled:
                 # Fall back to text search if embeddings are disabled
                 logger.warning("Embeddings disabled, falling back to text search")
+                if not years and year_min is not None and year_max is not None:
+                    years = list(range(year_min, year_max + 1))
                 return self.search_speeches(
                     query_text=query_text,
                     countries=countries,
@@ -434,11 +667,11 @@ class SimpleVectorStorageManager:
                     limit=limit
                 )
             
-            # Generate embedding for query
-            query_embedding = self.generate_embedding(query_text)
+            # Generate embedding for query (cached across repeated searches)
+            query_embedding = self.get_query_embedding(query_text)
             
-            # Ensure the query embedding is the same type as stored embeddings (tuple of floats)
-            query_embedding = tuple(float(x) for x in query_embedding)
+            # Ensure the query embedding is a plain list of floats
+            query_embedding = [float(x) for x in query_embedding]
             
             # Build where conditions for filters
             where_conditions = []
@@ -457,6 +690,14 @@ class SimpleVectorStorageManager:
                 where_conditions.append(f"year IN ({placeholders})")
                 params.extend(years)
             
+            # Year range filter
+            if year_min is not None:
+                where_conditions.append("year >= ?")
+                params.append(year_min)
+            if year_max is not None:
+                where_conditions.append("year <= ?")
+                params.append(year_max)
+            
             # Region filter
             if regions:
                 placeholders = ",".join(["?" for _ in regions])
@@ -465,17 +706,18 @@ class SimpleVectorStorageManager:
             
             where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
             
-            # Perform vector similarity search using cosine similarity
-            # Use a simpler approach with DuckDB's built-in functions
+            # Perform vector similarity search using cosine similarity.
+            # Casting the query to the fixed-size FLOAT[N] array type lets DuckDB
+            # use its native vectorized array_cosine_similarity kernel.
             result = self.conn.execute(f"""
                 SELECT id, country_code, country_name, region, session, year, 
                        speech_text, word_count, source_filename, is_african_member, created_at,
-                       array_cosine_similarity(embedding, ?::FLOAT[]) as similarity
+                       array_cosine_similarity(embedding, ?::FLOAT[{EMBEDDING_DIMENSION}]) as similarity
                 FROM speeches 
                 WHERE {where_clause} AND embedding IS NOT NULL
                 ORDER BY similarity DESC
                 LIMIT ?
-            """, [str(query_embedding)] + params + [limit]).fetchall()
+            """, [query_embedding] + params + [limit]).fetchall()
             
             # Convert to list of dictionaries
             results = []
@@ -503,6 +745,102 @@ class SimpleVectorStorageManager:
             logger.error(f"Semantic search failed: {e}")
             return []
     
+    def keyword_search(self, query_text: str, limit: int = 10,
+                       year_min: int = None, year_max: int = None) -> List[Dict[str, Any]]:
+        """Rank speeches by BM25 relevance using the full-text index.
+        
+        Returns an empty list when the fts extension is unavailable.
+        """
+        if not self.ensure_fts_index():
+            return []
+        
+        try:
+            where_conditions = ["score IS NOT NULL"]
+            params = [query_text]
+            if year_min is not None:
+                where_conditions.append("year >= ?")
+                params.append(year_min)
+            if year_max is not None:
+                where_conditions.append("year <= ?")
+                params.append(year_max)
+            
+            result = self.conn.execute(f"""
+                SELECT id, country_code, country_name, region, session, year,
+                       speech_text, word_count, source_filename, is_african_member, created_at, score
+                FROM (
+                    SELECT *, fts_main_speeches.match_bm25(id, ?) AS score
+                    FROM speeches
+                )
+                WHERE {' AND '.join(where_conditions)}
+                ORDER BY score DESC
+                LIMIT ?
+            """, params + [limit]).fetchall()
+            
+            return [
+                {
+                    'id': row[0],
+                    'country_code': row[1],
+                    'country_name': row[2],
+                    'region': row[3],
+                    'session': row[4],
+                    'year': row[5],
+                    'speech_text': row[6],
+                    'word_count': row[7],
+                    'source_filename': row[8],
+                    'is_african_member': row[9],
+                    'created_at': row[10],
+                    'bm25_score': row[11]
+                }
+                for row in result
+            ]
+        except Exception as e:
+            logger.error(f"Keyword search failed: {e}")
+            return []
+    
+    def hybrid_search(self, query_text: str, limit: int = 10,
+                      year_min: int = None, year_max: int = None,
+                      candidates: int = None, keyword_query: str = None) -> List[Dict[str, Any]]:
+        """Combine BM25 keyword and vector similarity rankings.
+        
+        Both searches return up to ``candidates`` speeches (default ``2 * limit``)
+        and are merged with reciprocal rank fusion,
+        ``score = sum(1 / (RRF_K + rank))``, so speeches ranked well by both
+        come first.
+        
+        Args:
+            query_text: Text to search for
+            limit: Number of fused results to return
+            year_min: Earliest year to include
+            year_max: Latest year to include
+            candidates: Results taken from each ranking before fusion
+            keyword_query: Shorter text for the BM25 ranking (defaults to query_text);
+                every query term is scored, so long passages make it slow
+            
+        Returns:
+            Speech dictionaries ordered by ``rrf_score``
+        """
+        candidates = candidates or limit * 2
+        rankings = [
+            self.keyword_search(keyword_query or query_text, limit=candidates,
+                                year_min=year_min, year_max=year_max),
+            self.semantic_search(query_text, limit=candidates,
+                                 year_min=year_min, year_max=year_max)
+        ]
+        
+        fused: Dict[int, Dict[str, Any]] = {}
+        for ranking in rankings:
+            for rank, speech in enumerate(ranking, 1):
+                speech_id = speech.get('id')
+                if speech_id is None:
+                    continue
+                entry = fused.setdefault(speech_id, {**speech, 'rrf_score': 0.0})
+                entry.update({k: v for k, v in speech.items() if k not in entry})
+                entry['rrf_score'] += 1.0 / (RRF_K + rank)
+        
+        results = sorted(fused.values(), key=lambda s: s['rrf_score'], reverse=True)[:limit]
+        logger.info(f"Hybrid search returned {len(results)} results")
+        return results
+    
     def find_similar_speeches(self, speech_id: int, limit: int = 5, 
                              similarity_threshold: float = 0.8) -> List[Dict[str, Any]]:
         """Find speeches similar to a given speech."""
@@ -596,6 +934,29 @@ class SimpleVectorStorageManager:
             logger.error(f"Failed to get analysis {analysis_id}: {e}")
             return None
     
+    def find_analysis(self, content_hash: str, model: str, classification: str) -> Optional[Dict[str, Any]]:
+        """Get the latest analysis of the same text with the same model and classification."""
+        try:
+            result = self.conn.execute("""
+                SELECT id, output_markdown, created_at
+                FROM analyses
+                WHERE text_sha256 = ? AND model = ? AND classification = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+            """, [content_hash, model, classification]).fetchone()
+            
+            if result:
+                return {
+                    "id": result[0],
+                    "output_markdown": result[1],
+                    "created_at": result[2]
+                }
+            return None
+            
+        except Exception as e:
+            logger.error(f"Failed to look up cached analysis: {e}")
+            return None
+    
     def list_analyses(self, filters: Optional[Dict[str, Any]] = None, 
                      limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """List analyses with optional filters."""
@@ -660,7 +1021,8 @@ class SimpleVectorStorageManager:
     def save_speech_data(self, country_code: str, country_name: str, region: str, 
                         session: int, year: int, speech_text: str, 
                         source_filename: str = None, is_african_member: bool = False,
-                        metadata: Dict = None) -> int:
+                        metadata: Dict = None, content_hash: str = None,
+                        word_count: int = None) -> int:
         """Save speech data (alias for save_speech for compatibility)."""
         return self.save_speech(
             country_code=country_code,
@@ -671,7 +1033,9 @@ class SimpleVectorStorageManager:
             speech_text=speech_text,
             source_filename=source_filename,
             is_african_member=is_african_member,
-            metadata=metadata
+            metadata=metadata,
+            content_hash=content_hash,
+            word_count=word_count
         )
     
     def create_db_and_tables(self):
@@ -817,7 +1181,14 @@ class SimpleVectorStorageManager:
     def close(self):
         """Close database connection."""
         if self.conn:
+            try:
+                # Fold the write-ahead log into the database file so the next
+                # start doesn't have to replay it
+                self.conn.execute("CHECKPOINT")
+            except Exception as e:
+                logger.warning(f"Checkpoint on close failed: {e}")
             self.conn.close()
 
 # Global instance
 simple_vector_storage = SimpleVectorStorageManager()
+atexit.register(simple_vector_storage.close)
@@ -5,6 +5,7 @@ Production-ready UNGA speech analysis platform
 
 import sys
 import os
+import threading
 import streamlit as st
 from pathlib import Path
 from dotenv import load_dotenv
@@ -45,6 +46,19 @@ from src.unga_analysis.ui.enhanced_ui_components import (
 # Initialize user authentication
 user_auth_manager = UserAuthManager()
 
+
+@st.cache_resource(show_spinner=False)
+def start_background_prewarm() -> threading.Thread:
+    """Load slow-to-initialise libraries off the script thread, once per process."""
+    from src.unga_analysis.data.data_ingestion import prewarm_language_detection
+    
+    thread = threading.Thread(target=prewarm_language_detection, daemon=True)
+    thread.start()
+    return thread
+
+
+start_background_prewarm()
+
 def initialize_session_state():
     """Initialize session state variables."""
     if 'authenticated' not in st.session_state:
@@ -362,9 +376,9 @@ def main():
             self.purpose = "Testing purposes"
     
     # Get current user info (using mock user for testing)
-    if not hasattr(st.session_state, 'user') or st.session_state.user is None:
-        st.session_state.user = MockUser()
-    current_user = st.session_state.user
+    current_user = st.session_state.get('user')
+    if current_user is None:
+        current_user = st.session_state.user = MockUser()
     
     # Initialize database
     try:
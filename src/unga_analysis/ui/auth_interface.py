@@ -410,9 +410,9 @@ def logout_user():
 
 def is_user_authenticated() -> bool:
     """Check if user is authenticated."""
-    return hasattr(st.session_state, 'user') and st.session_state.user is not None
+    return st.session_state.get('user') is not None
 
 
 def get_current_user() -> Optional[User]:
     """Get the current authenticated user."""
-    return st.session_state.user if hasattr(st.session_state, 'user') else None
\ No newline at end of file
+    return st.session_state.get('user')
\ No newline at end of file
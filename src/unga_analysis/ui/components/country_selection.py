@@ -5,25 +5,29 @@ Country selection component
 import streamlit as st
 from typing import Tuple, Optional
 from src.unga_analysis.config.countries import get_all_countries
-from src.unga_analysis.core.classify import get_au_members
+from src.unga_analysis.core.classify import AU_MEMBERS
 from datetime import date
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _country_options() -> tuple:
+    """Country names for the selector, built once rather than on every rerun."""
+    return ("",) + tuple(get_all_countries())
 
 
 def render_country_selection() -> Tuple[str, Optional[date], Optional[str]]:
     """Render country selection section."""
-    # Get comprehensive list of all world countries and entities
-    all_countries = get_all_countries()
-    
-    # Simple dropdown with all countries
+    # Simple dropdown with all world countries and entities
     country = st.selectbox(
         "Select Country/Entity",
-        options=[""] + all_countries,
+        options=_country_options(),
         help="Choose from the complete list of countries and entities"
     )
     
     # Auto-detect if it's an African Member State
     if country:
-        is_african_member = country in get_au_members()
+        is_african_member = country in AU_MEMBERS
         classification = "African Member State" if is_african_member else "Development Partner"
         
         # Show classification
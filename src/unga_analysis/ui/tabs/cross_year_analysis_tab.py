@@ -377,19 +377,13 @@ def render_cross_year_analysis_tab():
     if 'cross_year_chat_history' not in st.session_state:
         st.session_state.cross_year_chat_history = []
     
-    # Get data summary
-    cross_year_manager = CrossYearAnalysisManager()
-    data_summary = cross_year_manager.get_data_summary()
-    
     # Render the text-based analysis interface
     render_text_analysis_interface()
 
 def render_text_analysis_interface():
     """Render the text-based analysis interface."""
     
-    # Get data summary
     cross_year_manager = CrossYearAnalysisManager()
-    data_summary = cross_year_manager.get_data_summary()
     
     # Instructions
     st.info("""
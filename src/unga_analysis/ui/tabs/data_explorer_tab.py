@@ -7,6 +7,7 @@ import pandas as pd
 import plotly.express as px
 from typing import List, Dict, Any
 from src.unga_analysis.data.cross_year_analysis import cross_year_manager
+from src.unga_analysis.ui.ui_components import cached_data_summary
 
 
 def perform_speech_search(years=None, regions=None, country_search=None, au_members_only=False, query_text=None):
@@ -269,7 +270,7 @@ def render_data_explorer_tab():
     st.markdown("**Visualize speech data availability by country and year**")
     
     # Get data summary
-    data_summary = cross_year_manager.get_data_summary()
+    data_summary = cached_data_summary()
     
     if not data_summary:
         st.info("📊 No data available yet. Upload speech files to see visualizations.")
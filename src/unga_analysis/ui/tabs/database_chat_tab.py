@@ -3,12 +3,15 @@ Database Chat Tab Module
 Handles database querying and chat functionality for data availability and insights
 """
 
+import heapq
+import re
+import traceback
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from ...data.simple_vector_storage import simple_vector_storage as db_manager
-from ...core.llm import run_analysis, get_available_models
+from ...core.llm import run_analysis, run_analysis_stream, get_available_models
 from ...core.openai_client import get_openai_client
 from ...core.enhanced_search_engine import get_enhanced_search_engine
 from ...utils.region_utils import (
@@ -17,6 +20,19 @@ from ...utils.region_utils import (
 )
 from ..unified_search_interface import render_unified_search_interface, render_search_suggestions
 
+# Bounds on the chat history kept in session state
+MAX_CHAT_HISTORY = 50
+MAX_STORED_ANSWER_CHARS = 10_000
+
+# st.write_stream (Streamlit >= 1.31) shows the answer as it is generated
+WRITE_STREAM_AVAILABLE = hasattr(st, 'write_stream')
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_available_models() -> List[str]:
+    """Model list for the selector, cached so reruns do not refetch it."""
+    return get_available_models()
+
 
 def render_database_chat_tab():
     """Render the database chat tab."""
@@ -51,7 +67,7 @@ def render_database_chat_tab():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        available_models = get_available_models()
+        available_models = _cached_available_models()
         if available_models:
             model = st.selectbox(
                 "AI Model:",
@@ -76,13 +92,15 @@ def render_database_chat_tab():
         st.markdown("---")
         st.markdown("### 📜 Chat History")
         
-        for i, chat in enumerate(reversed(st.session_state.db_chat_history[-5:])):  # Show last 5
-            with st.expander(f"Q{i+1}: {chat['question'][:50]}...", expanded=False):
-                st.markdown(f"**Question:** {chat['question']}")
-                st.markdown(f"**Answer:** {chat['answer']}")
-                if chat.get('data_summary'):
-                    st.markdown(f"**Data Summary:** {chat['data_summary']}")
-                st.markdown(f"**Timestamp:** {chat['timestamp']}")
+        # Only render the history expanders on demand
+        if st.toggle("Show history", value=False, key="db_chat_show_history"):
+            for i, chat in enumerate(reversed(st.session_state.db_chat_history[-5:])):  # Show last 5
+                with st.expander(f"Q{i+1}: {chat['question'][:50]}...", expanded=False):
+                    st.markdown(f"**Question:** {chat['question']}")
+                    st.markdown(f"**Answer:** {chat['answer']}")
+                    if chat.get('data_summary'):
+                        st.markdown(f"**Data Summary:** {chat['data_summary']}")
+                    st.markdown(f"**Timestamp:** {chat['timestamp']}")
 
 
 def process_database_query(question: str, model: str):
@@ -95,35 +113,40 @@ def process_database_query(question: str, model: str):
             # Execute enhanced search
             search_results = enhanced_search.execute_enhanced_search(question)
             
-            # Generate AI response with comprehensive data and proper citations
-            ai_response = generate_enhanced_ai_response(question, search_results, model)
-            
-            # Store in chat history
-            st.session_state.db_chat_history.append({
-                'question': question,
-                'answer': ai_response,
-                'search_strategy': search_results.get('strategy', 'unknown'),
-                'total_found': search_results.get('total_found', 0),
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-            
-            # Display results
-            st.markdown("### 🤖 AI Response")
+        # Stream the AI response with comprehensive data and proper citations
+        st.markdown("### 🤖 AI Response")
+        if WRITE_STREAM_AVAILABLE:
+            ai_response = st.write_stream(
+                generate_enhanced_ai_response_stream(question, search_results, model)
+            )
+        else:
+            with st.spinner("🤖 Generating AI response..."):
+                ai_response = generate_enhanced_ai_response(question, search_results, model)
             st.markdown(ai_response)
-            
-            # Display search strategy used
-            if search_results.get('strategy'):
-                st.info(f"🔍 **Search Strategy Used:** {search_results['strategy'].replace('_', ' ').title()}")
-            
-            # Display supporting data with proper citations
-            if search_results.get('results'):
-                display_supporting_data_with_citations(search_results['results'])
-            
-            st.success("✅ Analysis completed!")
-            
+        
+        # Store in chat history
+        # (the full answer was streamed above; history keeps a bounded copy)
+        st.session_state.db_chat_history.append({
+            'question': question,
+            'answer': ai_response[:MAX_STORED_ANSWER_CHARS],
+            'search_strategy': search_results.get('strategy', 'unknown'),
+            'total_found': search_results.get('total_found', 0),
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+        st.session_state.db_chat_history = st.session_state.db_chat_history[-MAX_CHAT_HISTORY:]
+        
+        # Display search strategy used
+        if search_results.get('strategy'):
+            st.info(f"🔍 **Search Strategy Used:** {search_results['strategy'].replace('_', ' ').title()}")
+        
+        # Display supporting data with proper citations
+        if search_results.get('results'):
+            display_supporting_data_with_citations(search_results['results'])
+        
+        st.success("✅ Analysis completed!")
+        
     except Exception as e:
         st.error(f"❌ Analysis failed: {e}")
-        import traceback
         st.code(traceback.format_exc())
 
 
@@ -164,31 +187,52 @@ def comprehensive_database_search(question: str) -> Dict[str, Any]:
             search_results['speeches'] = speeches_data
             search_results['summary'] = f"Found {len(speeches_data)} relevant speeches"
             
-            # Create summary table
+            # Create summary table (built column-wise to skip per-row dicts)
             if speeches_data:
-                df_data = []
-                for speech in speeches_data[:20]:  # Limit to 20 for display
-                    df_data.append({
-                        'Country': speech.get('country_name', 'Unknown'),
-                        'Year': speech.get('year', 'Unknown'),
-                        'Word Count': speech.get('word_count', 0),
-                        'Speech Preview': speech.get('speech_text', '')[:200] + '...' if len(speech.get('speech_text', '')) > 200 else speech.get('speech_text', ''),
-                        'Date Added': speech.get('created_at', 'Unknown')
-                    })
+                display_speeches = speeches_data[:20]  # Limit to 20 for display
+                n = len(display_speeches)
+                countries_col = [None] * n
+                years_col = [None] * n
+                word_counts_col = [None] * n
+                previews_col = [None] * n
+                added_col = [None] * n
+                for i, speech in enumerate(display_speeches):
+                    text = speech.get('speech_text', '')
+                    countries_col[i] = speech.get('country_name', 'Unknown')
+                    years_col[i] = speech.get('year', 'Unknown')
+                    word_counts_col[i] = speech.get('word_count', 0)
+                    previews_col[i] = text[:200] + '...' if len(text) > 200 else text
+                    added_col[i] = speech.get('created_at', 'Unknown')
+                
+                search_results['table_data'] = pd.DataFrame({
+                    'Country': countries_col,
+                    'Year': years_col,
+                    'Word Count': word_counts_col,
+                    'Speech Preview': previews_col,
+                    'Date Added': added_col
+                })
                 
-                search_results['table_data'] = pd.DataFrame(df_data)
+                # Extract unique countries, years and word totals in one pass
+                total_words = 0
+                countries_found = set()
+                years_covered = set()
+                for s in speeches_data:
+                    total_words += s.get('word_count', 0) or 0
+                    if s.get('country_name'):
+                        countries_found.add(s['country_name'])
+                    if s.get('year'):
+                        years_covered.add(s['year'])
                 
-                # Extract unique countries and years
-                search_results['countries_found'] = list(set([s.get('country_name', '') for s in speeches_data if s.get('country_name')]))
-                search_results['years_covered'] = list(set([s.get('year', '') for s in speeches_data if s.get('year')]))
+                search_results['countries_found'] = list(countries_found)
+                search_results['years_covered'] = list(years_covered)
                 
                 # Generate statistics
                 search_results['statistics'] = {
                     'total_speeches': len(speeches_data),
-                    'countries_count': len(search_results['countries_found']),
-                    'years_span': f"{min(search_results['years_covered'])}-{max(search_results['years_covered'])}" if search_results['years_covered'] else 'Unknown',
-                    'total_words': sum([s.get('word_count', 0) for s in speeches_data]),
-                    'avg_words': sum([s.get('word_count', 0) for s in speeches_data]) // len(speeches_data) if speeches_data else 0
+                    'countries_count': len(countries_found),
+                    'years_span': f"{min(years_covered)}-{max(years_covered)}" if years_covered else 'Unknown',
+                    'total_words': total_words,
+                    'avg_words': total_words // len(speeches_data)
                 }
         else:
             search_results['summary'] = "No relevant speeches found. Try broadening your search criteria."
@@ -201,7 +245,6 @@ def comprehensive_database_search(question: str) -> Dict[str, Any]:
 
 def extract_years_from_question(question: str) -> List[int]:
     """Extract years from the question."""
-    import re
     years = re.findall(r'\b(19|20)\d{2}\b', question)
     return [int(year) for year in years]
 
@@ -237,6 +280,11 @@ def search_speeches_by_entities(countries: List[str], regions: List[str], years:
         # Build SQL query based on available entities
         where_conditions = []
         params = []
+        order_by = "year DESC, word_count DESC"
+        source = "speeches"
+        source_params = []
+        use_fts = bool(topics) or not (countries or years)
+        fts_available = use_fts and db_manager.ensure_fts_index()
 
         countries = sorted(set(countries))
         regions = sorted(set(regions))
@@ -265,42 +313,49 @@ def search_speeches_by_entities(countries: List[str], regions: List[str], years:
                 where_conditions.append("year = ?")
                 params.append(years[0])
             else:
-                year_range = f"year BETWEEN {min(years)} AND {max(years)}"
-                where_conditions.append(year_range)
+                where_conditions.append("year BETWEEN ? AND ?")
+                params.extend([min(years), max(years)])
         
-        # Topic conditions (search in speech text)
+        # Text terms: topics, or question keywords when no specific entities
+        text_terms = []
         if topics:
-            topic_conditions = []
-            for topic in topics:
-                topic_conditions.append("speech_text ILIKE ?")
-                params.append(f"%{topic}%")
-            
-            if topic_conditions:
-                where_conditions.append(f"({' OR '.join(topic_conditions)})")
-        
-        # If no specific entities, search for question keywords in speech text
-        if not countries and not years and not topics:
+            text_terms = topics
+        elif not countries and not years:
             # Extract key words from the question for text search
-            import re
             words = re.findall(r'\b\w{4,}\b', question.lower())  # Words with 4+ characters
-            if words:
+            text_terms = words[:5]  # Limit to 5 words
+        
+        if text_terms:
+            # BM25 scores single words, so multi-word topics such as "human
+            # rights" still need a phrase match to keep their meaning
+            phrase_match = any(len(term.split()) > 1 for term in text_terms)
+            if fts_available:
+                # BM25 full-text match, scored once per row for filtering and ordering
+                source = """(
+                    SELECT *, fts_main_speeches.match_bm25(id, ?) AS score
+                    FROM speeches
+                )"""
+                source_params = [' '.join(text_terms)]
+                if not phrase_match:
+                    where_conditions.append("score IS NOT NULL")
+                order_by = "score DESC NULLS LAST, year DESC"
+            if phrase_match or not fts_available:
                 text_conditions = []
-                for word in words[:5]:  # Limit to 5 words
+                for term in text_terms:
                     text_conditions.append("speech_text ILIKE ?")
-                    params.append(f"%{word}%")
-                
-                if text_conditions:
-                    where_conditions.append(f"({' OR '.join(text_conditions)})")
+                    params.append(f"%{term}%")
+                where_conditions.append(f"({' OR '.join(text_conditions)})")
         
         # Build final query
         if where_conditions:
             query = f"""
                 SELECT country_name, year, speech_text, word_count, created_at, region
-                FROM speeches 
+                FROM {source}
                 WHERE {' AND '.join(where_conditions)}
-                ORDER BY year DESC, word_count DESC
+                ORDER BY {order_by}
                 LIMIT 50
             """
+            params = source_params + params
         else:
             # Fallback: get recent speeches
             query = """
@@ -334,76 +389,83 @@ def search_speeches_by_entities(countries: List[str], regions: List[str], years:
         return []
 
 
-def generate_enhanced_ai_response(question: str, search_results: Dict[str, Any], model: str) -> str:
-    """Generate enhanced AI response with proper document citations."""
-    try:
-        system_message = """You are an expert analyst for the UN General Assembly speeches database (1946-2025). 
-        You provide comprehensive insights about historical trends, country priorities, and thematic analysis.
-        
-        CRITICAL REQUIREMENTS:
-        - ALWAYS cite specific speeches with country name and year when referencing content
-        - Use proper citation format: "As stated by [Country] in [Year]: '[quote]'"
-        - Provide specific examples with exact quotes and their sources
-        - Include document references for all claims and statistics
-        - When analyzing trends, cite multiple speeches from different years/countries
+def build_enhanced_ai_prompts(question: str, search_results: Dict[str, Any]) -> Tuple[str, str]:
+    """Build the system and user messages for a cited database answer."""
+    system_message = """You are an expert analyst for the UN General Assembly speeches database (1946-2025). 
+    You provide comprehensive insights about historical trends, country priorities, and thematic analysis.
+    
+    CRITICAL REQUIREMENTS:
+    - ALWAYS cite specific speeches with country name and year when referencing content
+    - Use proper citation format: "As stated by [Country] in [Year]: '[quote]'"
+    - Provide specific examples with exact quotes and their sources
+    - Include document references for all claims and statistics
+    - When analyzing trends, cite multiple speeches from different years/countries
+    
+    Your role:
+    - Analyze historical trends and changes in country priorities over time
+    - Provide detailed thematic analysis of speech content with proper citations
+    - Compare countries and regions on various topics with specific examples
+    - Explain patterns and evolution in UNGA discourse with supporting evidence
+    - Use the provided speech data to give specific, evidence-based answers with proper attribution
+    
+    Always base your analysis on the actual speech data provided. Be specific about years, countries, and themes.
+    If analyzing changes over time, compare different periods and highlight key shifts with proper citations."""
+    
+    # Prepare enhanced context with proper citations
+    speeches_context = ""
+    if search_results.get('results'):
+        results = search_results['results']
+        speeches_context = f"""
+        Found {len(results)} relevant speeches from the database:
         
-        Your role:
-        - Analyze historical trends and changes in country priorities over time
-        - Provide detailed thematic analysis of speech content with proper citations
-        - Compare countries and regions on various topics with specific examples
-        - Explain patterns and evolution in UNGA discourse with supporting evidence
-        - Use the provided speech data to give specific, evidence-based answers with proper attribution
+        Search Strategy: {search_results.get('strategy', 'unknown')}
+        Query Analysis: {search_results.get('analysis', {})}
         
-        Always base your analysis on the actual speech data provided. Be specific about years, countries, and themes.
-        If analyzing changes over time, compare different periods and highlight key shifts with proper citations."""
+        Speech Data with Citations:
+        """
         
-        # Prepare enhanced context with proper citations
-        speeches_context = ""
-        if search_results.get('results'):
-            results = search_results['results']
-            speeches_context = f"""
-            Found {len(results)} relevant speeches from the database:
+        # Include speeches with proper citation format
+        for i, speech in enumerate(results[:15]):  # Limit to 15 speeches for context
+            citation = speech.get('citation', f"{speech.get('country_name', 'Unknown')}, {speech.get('year', 'Unknown')}")
+            relevance_score = speech.get('relevance_score', 0)
+            relevant_quotes = speech.get('relevant_quotes', [])
             
-            Search Strategy: {search_results.get('strategy', 'unknown')}
-            Query Analysis: {search_results.get('analysis', {})}
+            speeches_context += f"""
+        Speech {i+1}: {citation} (Relevance: {relevance_score:.2f})
+        Text: {speech.get('speech_text', '')[:400]}...
+        
+        Relevant Quotes:
+        """
             
-            Speech Data with Citations:
-            """
+            for quote in relevant_quotes[:3]:  # Top 3 quotes
+                speeches_context += f"            - \"{quote['quote']}\" (Relevance: {quote['relevance_score']:.2f})\n"
             
-            # Include speeches with proper citation format
-            for i, speech in enumerate(results[:15]):  # Limit to 15 speeches for context
-                citation = speech.get('citation', f"{speech.get('country_name', 'Unknown')}, {speech.get('year', 'Unknown')}")
-                relevance_score = speech.get('relevance_score', 0)
-                relevant_quotes = speech.get('relevant_quotes', [])
-                
-                speeches_context += f"""
-            Speech {i+1}: {citation} (Relevance: {relevance_score:.2f})
-            Text: {speech.get('speech_text', '')[:400]}...
-            
-            Relevant Quotes:
-            """
-                
-                for quote in relevant_quotes[:3]:  # Top 3 quotes
-                    speeches_context += f"            - \"{quote['quote']}\" (Relevance: {quote['relevance_score']:.2f})\n"
-                
-                speeches_context += "\n"
-        
-        user_message = f"""User Question: {question}
+            speeches_context += "\n"
+    
+    user_message = f"""User Question: {question}
 
-        {speeches_context}
-        
-        Please provide a comprehensive analysis answering the user's question. 
-        
-        REQUIREMENTS:
-        1. Use the specific speech data provided to give evidence-based insights
-        2. ALWAYS cite speeches using the format: "As stated by [Country] in [Year]: '[exact quote]'"
-        3. Include specific examples with proper attribution
-        4. If analyzing changes over time, compare different periods with specific citations
-        5. If comparing countries, highlight differences and similarities with quoted examples
-        6. Be specific about what the data shows and cite examples from the speeches when relevant
-        7. Include document references for all statistical claims
-        
-        Format your response with proper citations throughout."""
+    {speeches_context}
+    
+    Please provide a comprehensive analysis answering the user's question. 
+    
+    REQUIREMENTS:
+    1. Use the specific speech data provided to give evidence-based insights
+    2. ALWAYS cite speeches using the format: "As stated by [Country] in [Year]: '[exact quote]'"
+    3. Include specific examples with proper attribution
+    4. If analyzing changes over time, compare different periods with specific citations
+    5. If comparing countries, highlight differences and similarities with quoted examples
+    6. Be specific about what the data shows and cite examples from the speeches when relevant
+    7. Include document references for all statistical claims
+    
+    Format your response with proper citations throughout."""
+    
+    return system_message, user_message
+
+
+def generate_enhanced_ai_response(question: str, search_results: Dict[str, Any], model: str) -> str:
+    """Generate enhanced AI response with proper document citations."""
+    try:
+        system_message, user_message = build_enhanced_ai_prompts(question, search_results)
         
         response = run_analysis(
             system_message,
@@ -418,6 +480,22 @@ def generate_enhanced_ai_response(question: str, search_results: Dict[str, Any],
         return f"AI analysis failed: {e}. However, here's the raw data: {search_results.get('summary', 'No data available')}"
 
 
+def generate_enhanced_ai_response_stream(question: str, search_results: Dict[str, Any], model: str) -> Iterator[str]:
+    """Stream an enhanced AI response with proper document citations."""
+    try:
+        system_message, user_message = build_enhanced_ai_prompts(question, search_results)
+        
+        yield from run_analysis_stream(
+            system_message,
+            user_message,
+            model,
+            get_openai_client()
+        )
+        
+    except Exception as e:
+        yield f"AI analysis failed: {e}. However, here's the raw data: {search_results.get('summary', 'No data available')}"
+
+
 def display_supporting_data_with_citations(results: List[Dict[str, Any]]):
     """Display supporting data with proper citations."""
     if not results:
@@ -425,24 +503,31 @@ def display_supporting_data_with_citations(results: List[Dict[str, Any]]):
     
     st.markdown("### 📋 Supporting Data with Citations")
     
-    # Create a summary table
-    summary_data = []
-    for result in results[:20]:  # Limit to top 20 results
-        citation = result.get('citation', f"{result.get('country_name', 'Unknown')}, {result.get('year', 'Unknown')}")
-        relevance_score = result.get('relevance_score', 0)
-        word_count = result.get('word_count', 0)
-        
-        summary_data.append({
-            'Citation': citation,
-            'Relevance Score': f"{relevance_score:.2f}",
-            'Word Count': f"{word_count:,}",
-            'Region': result.get('region', 'Unknown'),
-            'Preview': result.get('speech_text', '')[:100] + '...' if len(result.get('speech_text', '')) > 100 else result.get('speech_text', '')
-        })
+    # Create a summary table (built column-wise to skip per-row dicts)
+    top_results = results[:20]  # Limit to top 20 results
+    n = len(top_results)
+    citations = [None] * n
+    relevance_scores = [None] * n
+    word_counts = [None] * n
+    regions = [None] * n
+    previews = [None] * n
+    for i, result in enumerate(top_results):
+        text = result.get('speech_text', '')
+        citations[i] = result.get('citation', f"{result.get('country_name', 'Unknown')}, {result.get('year', 'Unknown')}")
+        relevance_scores[i] = f"{result.get('relevance_score', 0):.2f}"
+        word_counts[i] = f"{result.get('word_count', 0):,}"
+        regions[i] = result.get('region', 'Unknown')
+        previews[i] = text[:100] + '...' if len(text) > 100 else text
     
     # Display summary table
-    if summary_data:
-        df = pd.DataFrame(summary_data)
+    if n:
+        df = pd.DataFrame({
+            'Citation': citations,
+            'Relevance Score': relevance_scores,
+            'Word Count': word_counts,
+            'Region': regions,
+            'Preview': previews
+        })
         st.dataframe(df, use_container_width=True)
     
     # Display relevant quotes with proper citations
@@ -455,11 +540,11 @@ def display_supporting_data_with_citations(results: List[Dict[str, Any]]):
             quote['source_citation'] = result.get('citation', f"{result.get('country_name', 'Unknown')}, {result.get('year', 'Unknown')}")
             all_quotes.append(quote)
     
-    # Sort quotes by relevance
-    all_quotes.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    # Select the top quotes by relevance without sorting the full list
+    top_quotes = heapq.nlargest(10, all_quotes, key=lambda x: x.get('relevance_score', 0))
     
     # Display top quotes
-    for i, quote in enumerate(all_quotes[:10]):
+    for i, quote in enumerate(top_quotes):
         with st.expander(f"Quote {i+1}: {quote['source_citation']} (Relevance: {quote['relevance_score']:.2f})"):
             st.markdown(f"**Source:** {quote['source_citation']}")
             st.markdown(f"**Quote:** \"{quote['quote']}\"")
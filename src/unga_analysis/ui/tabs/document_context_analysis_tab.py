@@ -4,17 +4,25 @@ Handles document-based analysis that combines uploaded documents with UNGA corpu
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Set
+import csv
+import hashlib
+import io
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import tempfile
 from pathlib import Path
 
 # Import existing modules
 from src.unga_analysis.data.ingest import extract_text_from_file, validate_text_length
-from src.unga_analysis.core.llm import run_analysis, get_available_models
-from src.unga_analysis.data.simple_vector_storage import simple_vector_storage as db_manager
+from src.unga_analysis.core.llm import run_analysis, run_analysis_stream, get_available_models
+from src.unga_analysis.data.simple_vector_storage import (
+    simple_vector_storage as db_manager,
+    EMBEDDING_TEXT_LIMIT,
+)
 from src.unga_analysis.utils.export_utils import create_export_files
 from src.unga_analysis.core.prompts import build_user_prompt
 from src.unga_analysis.utils.region_utils import (
@@ -22,26 +30,153 @@ from src.unga_analysis.utils.region_utils import (
     expand_regions_to_countries,
 )
 
-# Import OpenAI client creation
-import openai
+# Shared Azure OpenAI client
+from src.unga_analysis.core.openai_client import get_openai_client
 from dotenv import load_dotenv
 load_dotenv()
 
+# Minimum cosine similarity between analysis prompts for a cached result to be reused
+ANALYSIS_CACHE_SIMILARITY = 0.95
+# Length of the document opening used as the keyword (BM25) search query
+KEYWORD_QUERY_CHARS = 500
+# Number of finished analyses kept per session for reuse (oldest dropped first)
+ANALYSIS_CACHE_SIZE = 20
+# st.write_stream (Streamlit >= 1.31) shows the analysis as it is generated
+WRITE_STREAM_AVAILABLE = hasattr(st, 'write_stream')
+# Number of extracted document texts kept per session (oldest dropped first)
+MAX_EXTRACTED_TEXTS = 8
+
+
+def _cached_texts() -> Dict[str, str]:
+    """Per-session extracted texts keyed by the SHA-256 of the file content."""
+    return st.session_state.setdefault('extracted_texts', {})
+
+
+def _remember_text(file_hash: str, text: str) -> None:
+    """Keep an extracted text, dropping the oldest beyond MAX_EXTRACTED_TEXTS."""
+    texts = _cached_texts()
+    texts[file_hash] = text
+    while len(texts) > MAX_EXTRACTED_TEXTS:
+        del texts[next(iter(texts))]
+
+
+def extract_uploaded_text(file_bytes: bytes, filename: str) -> str:
+    """Extract text from uploaded file bytes, reusing earlier extractions."""
+    file_hash = hashlib.sha256(file_bytes).hexdigest()
+    text = _cached_texts().get(file_hash)
+    if text is None:
+        text = extract_text_from_file(file_bytes, filename)
+        _remember_text(file_hash, text)
+    return text
+
+
+def _upload_key(file) -> Any:
+    """Stable identifier for an uploaded file across reruns."""
+    return getattr(file, 'file_id', None) or (file.name, file.size)
+
 
-def get_openai_client():
-    """Get Azure OpenAI client."""
-    api_key = os.getenv('AZURE_OPENAI_API_KEY')
-    endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
-    api_version = os.getenv('AZURE_OPENAI_API_VERSION', '2024-12-01-preview')
+def sync_upload_bytes(uploaded_files: List) -> None:
+    """Keep the per-upload byte cache in step with the current uploads."""
+    current = {_upload_key(file) for file in uploaded_files or []}
+    cache = st.session_state.setdefault('upload_bytes', {})
+    for key in list(cache):
+        if key not in current:
+            del cache[key]
+
+
+def get_upload_bytes(file) -> bytes:
+    """Return an upload's bytes, copying them out of the upload buffer only once."""
+    cache = st.session_state.setdefault('upload_bytes', {})
+    key = _upload_key(file)
+    if key not in cache:
+        cache[key] = file.getvalue()
+    return cache[key]
+
+
+def _extract_one(item: tuple) -> tuple:
+    """Extract a single upload, returning (file, text, error) for the caller to report."""
+    file, file_bytes = item
+    try:
+        return file, extract_text_from_file(file_bytes, file.name), None
+    except Exception as e:
+        return file, None, e
+
+
+def extract_uploaded_files(uploaded_files: List) -> List[tuple]:
+    """Extract text from several uploads concurrently, preserving upload order."""
+    # Read bytes and look up earlier extractions on the script thread;
+    # session state is not available to workers
+    texts = _cached_texts()
+    results = {}
+    pending = []
+    for index, file in enumerate(uploaded_files):
+        file_bytes = get_upload_bytes(file)
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        if file_hash in texts:
+            results[index] = (file, texts[file_hash], None)
+        else:
+            pending.append((index, file_hash, (file, file_bytes)))
     
-    if not api_key or not endpoint:
-        raise ValueError("Azure OpenAI credentials not found in environment variables")
+    if len(pending) <= 1:
+        extracted = [_extract_one(item) for _, _, item in pending]
+    else:
+        # PDF/DOCX parsing spends most of its time in C code, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            extracted = list(executor.map(_extract_one, [item for _, _, item in pending]))
     
-    return openai.AzureOpenAI(
-        api_key=api_key,
-        azure_endpoint=endpoint,
-        api_version=api_version
+    for (index, file_hash, _), result in zip(pending, extracted):
+        if result[2] is None:
+            _remember_text(file_hash, result[1])
+        results[index] = result
+    return [results[index] for index in range(len(uploaded_files))]
+
+
+def build_search_query_text(texts: List[str], max_chars: int = EMBEDDING_TEXT_LIMIT) -> str:
+    """Build a bounded query for semantic search from the opening of each document."""
+    if not texts:
+        return ""
+    per_document = max(max_chars // len(texts), 1)
+    return "\n\n".join(text[:per_document] for text in texts)[:max_chars]
+
+
+def analysis_cache_key(combined_text: str, additional_context: str,
+                       year_range: tuple, model: str, analysis_depth: str = "Deep",
+                       max_context_speeches: int = 10) -> str:
+    """Key identifying the documents and settings an analysis was run with."""
+    digest = hashlib.sha256(combined_text.encode('utf-8'))
+    digest.update(
+        f"\0{additional_context}\0{year_range[0]}-{year_range[1]}\0{model}"
+        f"\0{analysis_depth}\0{max_context_speeches}".encode('utf-8')
     )
+    return digest.hexdigest()
+
+
+def find_cached_analysis(cache_key: str, prompt_embedding: List[float]) -> Optional[Dict[str, Any]]:
+    """Return an earlier result for the same documents and a near-identical prompt."""
+    query = np.asarray(prompt_embedding, dtype=np.float32)
+    query_norm = np.linalg.norm(query)
+    if not query_norm:
+        return None
+    
+    for entry in reversed(st.session_state.get('document_analysis_cache', [])):
+        if entry['cache_key'] != cache_key:
+            continue
+        cached = entry['prompt_embedding']
+        cached_norm = np.linalg.norm(cached)
+        if cached_norm and float(query @ cached) / (query_norm * cached_norm) >= ANALYSIS_CACHE_SIMILARITY:
+            return entry['result']
+    return None
+
+
+def store_cached_analysis(cache_key: str, prompt_embedding: List[float],
+                          result: Dict[str, Any]) -> None:
+    """Remember a finished analysis so similar follow-up requests can reuse it."""
+    cache = st.session_state.setdefault('document_analysis_cache', deque(maxlen=ANALYSIS_CACHE_SIZE))
+    cache.append({
+        'cache_key': cache_key,
+        'prompt_embedding': np.asarray(prompt_embedding, dtype=np.float32),
+        'result': result
+    })
 
 
 def render_document_context_analysis_tab():
@@ -62,6 +197,7 @@ def render_document_context_analysis_tab():
         accept_multiple_files=True,
         help="Upload PDF, DOCX, TXT, or audio files for analysis"
     )
+    sync_upload_bytes(uploaded_files)
     
     # Display uploaded files
     if uploaded_files:
@@ -144,7 +280,7 @@ def render_document_context_analysis_tab():
                 "Max Historical Speeches:",
                 min_value=5,
                 max_value=50,
-                value=20,
+                value=10,
                 help="Maximum number of historical speeches to include for context"
             )
         
@@ -169,8 +305,10 @@ def render_document_context_analysis_tab():
                 )
             
             if analysis_result:
-                # Add to analysis history
-                st.session_state.document_analysis_history.append(analysis_result)
+                # Add to analysis history (cache hits are already recorded there)
+                history = st.session_state.document_analysis_history
+                if not any(entry is analysis_result for entry in history):
+                    history.append(analysis_result)
                 
                 # Display results
                 render_document_analysis_results(analysis_result)
@@ -185,7 +323,7 @@ def preview_content(file):
     """Preview the content of an uploaded file."""
     try:
         # Extract text from file
-        text = extract_text_from_file(file.getvalue(), file.name)
+        text = extract_uploaded_text(get_upload_bytes(file), file.name)
         
         # Show preview
         st.markdown("#### 📄 Content Preview")
@@ -210,7 +348,7 @@ def process_document_analysis_simple(
     analysis_prompt: str,
     additional_context: str = "",
     year_range: tuple = (2000, 2024),
-    max_context_speeches: int = 20,
+    max_context_speeches: int = 10,
     model: str = "model-router-osaa-2",
     analysis_depth: str = "Deep"
 ) -> Optional[Dict[str, Any]]:
@@ -218,28 +356,52 @@ def process_document_analysis_simple(
     
     try:
         # Extract text from all uploaded files
-        combined_text = ""
+        text_parts = []
+        document_texts = []
         file_metadata = []
+        total_word_count = 0
         
-        for file in uploaded_files:
-            try:
-                text = extract_text_from_file(file.getvalue(), file.name)
-                if text:
-                    combined_text += f"\n\n--- {file.name} ---\n\n{text}"
-                    file_metadata.append({
-                        'name': file.name,
-                        'size': file.size,
-                        'text_length': len(text),
-                        'word_count': len(text.split())
-                    })
-            except Exception as e:
-                st.warning(f"⚠️ Could not process {file.name}: {str(e)}")
+        for file, text, error in extract_uploaded_files(uploaded_files):
+            if error is not None:
+                st.warning(f"⚠️ Could not process {file.name}: {str(error)}")
                 continue
+            if text:
+                word_count = len(text.split())
+                total_word_count += word_count
+                text_parts.append(f"\n\n--- {file.name} ---\n\n{text}")
+                document_texts.append(text)
+                file_metadata.append({
+                    'name': file.name,
+                    'size': file.size,
+                    'text_length': len(text),
+                    'word_count': word_count
+                })
+        
+        combined_text = "".join(text_parts)
         
         if not combined_text.strip():
             st.error("❌ No text could be extracted from uploaded files.")
             return None
         
+        # Reuse an earlier answer when the same documents are analysed again
+        # with an (almost) identical request, skipping search and the LLM call
+        cache_key = analysis_cache_key(combined_text, additional_context, year_range, model,
+                                       analysis_depth, max_context_speeches)
+        prompt_embedding = db_manager.get_query_embedding(analysis_prompt)
+        cached_result = find_cached_analysis(cache_key, prompt_embedding)
+        if cached_result is not None:
+            st.caption("♻️ Reusing a previous analysis of these documents for a matching request.")
+            return cached_result
+        
+        # Embed the search query in the background while entities are detected
+        # and the targeted search runs; semantic_search then reuses the cached
+        # embedding. Only the embedding is offloaded because the DuckDB
+        # connection must not be used from two threads at once.
+        query_text = build_search_query_text(document_texts)
+        embedding_executor = ThreadPoolExecutor(max_workers=1)
+        embedding_future = embedding_executor.submit(db_manager.get_query_embedding, query_text)
+        embedding_executor.shutdown(wait=False)
+        
         detected_regions: Set[str] = set()
         detected_countries: Set[str] = set()
         for fragment in [analysis_prompt, additional_context, combined_text]:
@@ -273,23 +435,29 @@ def process_document_analysis_simple(
                 if 'id' in speech:
                     collected[speech['id']] = speech
 
-        search_results = db_manager.semantic_search(
-            combined_text,
-            limit=max_context_speeches
+        try:
+            embedding_future.result()
+        except Exception:
+            pass  # semantic_search embeds again and reports any failure
+        
+        # Only a bounded window is embedded, so send one covering every document.
+        # Keyword (BM25) and vector rankings are fused, so fewer candidates
+        # are needed for the same context quality.
+        search_results = db_manager.hybrid_search(
+            query_text,
+            limit=max_context_speeches,
+            year_min=year_range[0],
+            year_max=year_range[1],
+            keyword_query=build_search_query_text(document_texts, max_chars=KEYWORD_QUERY_CHARS)
         )
 
         for speech in search_results or []:
             if 'id' in speech:
                 collected[speech['id']] = speech
 
+        # Both searches are already restricted to the selected year range
         similar_speeches = list(collected.values())
 
-        # Filter by year range
-        similar_speeches = [
-            speech for speech in similar_speeches
-            if year_range[0] <= speech.get('year', 0) <= year_range[1]
-        ]
-
         if detected_regions:
             allowed_countries = set(expand_regions_to_countries(detected_regions))
             if allowed_countries:
@@ -332,21 +500,34 @@ def process_document_analysis_simple(
         # Run AI analysis
         system_message = "You are an expert analyst specializing in UN General Assembly speeches and international relations. You have access to a comprehensive database of UNGA speeches from 1946-2025 and can provide detailed analysis combining current documents with historical context."
         
-        analysis_result = run_analysis(
-            system_msg=system_message,
-            user_msg=final_prompt,
-            model=model,
-            client=get_openai_client()
-        )
+        # Stream tokens into a temporary placeholder; the finished analysis is
+        # rendered once by render_document_analysis_results
+        if WRITE_STREAM_AVAILABLE:
+            stream_placeholder = st.empty()
+            with stream_placeholder.container():
+                analysis_result = st.write_stream(run_analysis_stream(
+                    system_msg=system_message,
+                    user_msg=final_prompt,
+                    model=model,
+                    client=get_openai_client()
+                ))
+            stream_placeholder.empty()
+        else:
+            analysis_result = run_analysis(
+                system_msg=system_message,
+                user_msg=final_prompt,
+                model=model,
+                client=get_openai_client()
+            )
         
         if analysis_result:
-            return {
+            result = {
                 'timestamp': datetime.now().isoformat(),
                 'analysis_prompt': analysis_prompt,
                 'additional_context': additional_context,
                 'file_metadata': file_metadata,
                 'document_count': len(uploaded_files),
-                'total_word_count': len(combined_text.split()),
+                'total_word_count': total_word_count,
                 'similar_speeches_count': len(similar_speeches),
                 'year_range': year_range,
                 'detected_regions': sorted(detected_regions),
@@ -358,6 +539,8 @@ def process_document_analysis_simple(
                 'similar_speeches': similar_speeches[:10],  # Store top 10 for display
                 'raw_text': combined_text[:5000]  # Store first 5000 chars for reference
             }
+            store_cached_analysis(cache_key, prompt_embedding, result)
+            return result
         
         return None
         
@@ -371,18 +554,30 @@ def build_historical_context(similar_speeches: List[Dict]) -> str:
     if not similar_speeches:
         return ""
     
-    context = "## Historical Context from UNGA Corpus\n\n"
+    parts = ["## Historical Context from UNGA Corpus\n\n"]
     
     for i, speech in enumerate(similar_speeches[:10], 1):  # Limit to top 10
         country_name = speech.get('country') or speech.get('country_name', 'Unknown')
-        context += f"### {i}. {country_name} ({speech.get('year', 'Unknown')})\n"
-        context += f"**Speaker:** {speech.get('speaker', 'Unknown')}\n"
-        context += f"**Similarity Score:** {speech.get('similarity', 0):.3f}\n"
-        context += f"**Content:** {speech.get('speech_text', '')[:500]}...\n\n"
+        parts.append(f"### {i}. {country_name} ({speech.get('year', 'Unknown')})\n")
+        parts.append(f"**Speaker:** {speech.get('speaker', 'Unknown')}\n")
+        # Keyword-only and targeted matches have no similarity of their own
+        if speech.get('similarity') is not None:
+            parts.append(f"**Similarity Score:** {speech['similarity']:.3f}\n")
+        elif speech.get('rrf_score') is not None:
+            parts.append(f"**Relevance Score:** {speech['rrf_score']:.4f}\n")
+        parts.append(f"**Content:** {speech.get('speech_text', '')[:500]}...\n\n")
     
-    return context
+    return "".join(parts)
 
 
+def speeches_to_csv(speeches: List[Dict[str, Any]]) -> str:
+    """Serialize speech dicts to CSV, with columns in first-seen key order."""
+    fieldnames = list(dict.fromkeys(key for speech in speeches for key in speech))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, restval='')
+    writer.writeheader()
+    writer.writerows(speeches)
+    return buffer.getvalue()
 
 
 def render_document_analysis_results(analysis_result: Dict[str, Any]):
@@ -469,11 +664,10 @@ def render_document_analysis_results(analysis_result: Dict[str, Any]):
         if st.button("📈 Export Historical Context", use_container_width=True, key="doc_context_export_historical"):
             # Create CSV of similar speeches
             if analysis_result['similar_speeches']:
-                df = pd.DataFrame(analysis_result['similar_speeches'])
-                csv = df.to_csv(index=False)
+                csv_data = speeches_to_csv(analysis_result['similar_speeches'])
                 st.download_button(
                     label="Download CSV",
-                    data=csv,
+                    data=csv_data,
                     file_name=f"historical_context_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -4,23 +4,86 @@ Provides AI-readable error analysis and system health monitoring.
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
 from ...utils.log_analyzer import LogAnalyzer, get_application_health, get_error_insights
-from ...utils.logging_config import get_log_insights, analyze_recent_errors
+from ...utils.logging_config import get_log_insights, analyze_recent_errors, shorten_error_message
+
+
+# Log files are re-read and re-parsed by every analyzer call, so the results
+# are cached for a minute instead of recomputed on each widget interaction.
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_health() -> Dict[str, Any]:
+    """Cached application health score."""
+    return LogAnalyzer().get_health_score()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_patterns() -> Dict[str, Any]:
+    """Cached error pattern analysis."""
+    return LogAnalyzer().analyze_error_patterns()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_ai_report() -> str:
+    """Cached AI-readable error report."""
+    return LogAnalyzer().generate_ai_report()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_suggested_fixes() -> List[Dict[str, str]]:
+    """Cached improvement suggestions derived from the error patterns."""
+    return LogAnalyzer().get_suggested_fixes()
+
+
+@st.cache_data(ttl=60, max_entries=16, show_spinner=False)
+def _cached_error_context(search_term: str) -> List[Dict[str, Any]]:
+    """Cached log entries matching an error search."""
+    return LogAnalyzer().find_error_context(search_term)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_recent_logs(hours: int, log_type: str) -> List[Dict[str, Any]]:
+    """Cached recent log entries of the given type."""
+    return LogAnalyzer().get_recent_logs(hours=hours, log_type=log_type)
+
+
+# Plotly validates every trace and layout attribute when a figure is built, so
+# figures are cached as plain dicts, which st.plotly_chart renders directly.
+@st.cache_data(ttl=60, show_spinner=False)
+def _error_distribution_figure(categories: tuple, counts: tuple) -> Dict[str, Any]:
+    """Cached pie chart of errors per category."""
+    # Plotly is heavy to import, so only load it once a chart renders
+    import plotly.express as px
+    
+    fig = px.pie(
+        values=list(counts),
+        names=list(categories),
+        title="Error Distribution by Category"
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _operation_duration_figure(operations: tuple, durations: tuple, components: tuple) -> Dict[str, Any]:
+    """Cached bar chart of operation durations by component."""
+    import plotly.express as px
+    
+    fig = px.bar(
+        x=list(operations),
+        y=list(durations),
+        color=list(components),
+        labels={'x': 'Operation', 'y': 'Duration (s)', 'color': 'Component'},
+        title="Operation Duration Analysis"
+    )
+    return fig.to_dict()
 
 def render_error_insights_tab():
     """Render the error insights and system health tab."""
     st.header("🔍 Error Insights & System Health")
     st.markdown("Monitor application health and understand error patterns for better AI assistance.")
     
-    # Initialize analyzer
-    analyzer = LogAnalyzer()
-    
     # Create tabs for different insights
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 Health Overview", 
@@ -30,23 +93,23 @@ def render_error_insights_tab():
     ])
     
     with tab1:
-        render_health_overview(analyzer)
+        render_health_overview()
     
     with tab2:
-        render_error_analysis(analyzer)
+        render_error_analysis()
     
     with tab3:
-        render_ai_insights(analyzer)
+        render_ai_insights()
     
     with tab4:
-        render_performance_metrics(analyzer)
+        render_performance_metrics()
 
-def render_health_overview(analyzer: LogAnalyzer):
+def render_health_overview():
     """Render system health overview."""
     st.subheader("System Health Status")
     
     # Get health score
-    health = analyzer.get_health_score()
+    health = _cached_health()
     
     # Display health score with color coding
     col1, col2, col3, col4 = st.columns(4)
@@ -99,12 +162,12 @@ def render_health_overview(analyzer: LogAnalyzer):
     st.subheader("Health Trend")
     st.info("Health trend analysis would show here with historical data collection.")
 
-def render_error_analysis(analyzer: LogAnalyzer):
+def render_error_analysis():
     """Render detailed error analysis."""
     st.subheader("Error Pattern Analysis")
     
     # Get error patterns
-    patterns = analyzer.analyze_error_patterns()
+    patterns = _cached_patterns()
     
     # Create error category chart
     error_categories = []
@@ -117,11 +180,7 @@ def render_error_analysis(analyzer: LogAnalyzer):
     
     if error_categories:
         # Create pie chart
-        fig = px.pie(
-            values=error_counts,
-            names=error_categories,
-            title="Error Distribution by Category"
-        )
+        fig = _error_distribution_figure(tuple(error_categories), tuple(error_counts))
         st.plotly_chart(fig, use_container_width=True)
         
         # Show detailed breakdown
@@ -144,23 +203,26 @@ def render_error_analysis(analyzer: LogAnalyzer):
         for error_key, error_info in recent_errors['top_errors']:
             error_data.append({
                 'Error Type': error_info['error_type'],
-                'Message': error_info['error_message'][:100] + "..." if len(error_info['error_message']) > 100 else error_info['error_message'],
+                # Summaries written before short_message existed are shortened here
+                'Message': error_info.get('short_message') or shorten_error_message(error_info['error_message']),
                 'Count': error_info['count'],
                 'Last Seen': error_info['last_seen']
             })
         
+        import pandas as pd
+        
         df = pd.DataFrame(error_data)
         st.dataframe(df, use_container_width=True)
     else:
         st.success("No recent errors in the last 24 hours!")
 
-def render_ai_insights(analyzer: LogAnalyzer):
+def render_ai_insights():
     """Render AI-readable insights."""
     st.subheader("AI Assistant Error Understanding")
     st.markdown("This section provides comprehensive error analysis for AI assistance.")
     
     # Get AI report
-    ai_report = analyzer.generate_ai_report()
+    ai_report = _cached_ai_report()
     
     # Display the report
     st.markdown(ai_report)
@@ -182,7 +244,7 @@ def render_ai_insights(analyzer: LogAnalyzer):
     
     # Suggested fixes
     st.subheader("Suggested Improvements")
-    suggestions = analyzer.get_suggested_fixes()
+    suggestions = _cached_suggested_fixes()
     
     if suggestions:
         for suggestion in suggestions:
@@ -194,12 +256,12 @@ def render_ai_insights(analyzer: LogAnalyzer):
     else:
         st.success("No specific improvement suggestions at this time.")
 
-def render_performance_metrics(analyzer: LogAnalyzer):
+def render_performance_metrics():
     """Render performance metrics."""
     st.subheader("Performance Monitoring")
     
     # Get recent logs
-    recent_logs = analyzer.get_recent_logs(hours=24, log_type="performance")
+    recent_logs = _cached_recent_logs(24, "performance")
     
     if recent_logs:
         # Extract performance data
@@ -215,13 +277,21 @@ def render_performance_metrics(analyzer: LogAnalyzer):
                 })
         
         if performance_data:
-            df = pd.DataFrame(performance_data)
+            import numpy as np
+            import pandas as pd
+            
+            # Reduce the durations with numpy rather than three pandas passes
+            durations = np.fromiter(
+                (row['Duration (s)'] for row in performance_data),
+                dtype=np.float64,
+                count=len(performance_data)
+            )
             
             # Performance summary
             st.subheader("Performance Summary")
-            avg_duration = df['Duration (s)'].mean()
-            max_duration = df['Duration (s)'].max()
-            min_duration = df['Duration (s)'].min()
+            avg_duration = durations.mean()
+            max_duration = durations.max()
+            min_duration = durations.min()
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -231,13 +301,13 @@ def render_performance_metrics(analyzer: LogAnalyzer):
             with col3:
                 st.metric("Min Duration", f"{min_duration:.2f}s")
             
+            df = pd.DataFrame(performance_data)
+            
             # Performance chart
-            fig = px.bar(
-                df, 
-                x='Operation', 
-                y='Duration (s)',
-                title="Operation Duration Analysis",
-                color='Component'
+            fig = _operation_duration_figure(
+                tuple(df['Operation']),
+                tuple(durations.tolist()),
+                tuple(df['Component'])
             )
             st.plotly_chart(fig, use_container_width=True)
             
@@ -269,8 +339,7 @@ def render_error_context_search():
     )
     
     if search_term:
-        analyzer = LogAnalyzer()
-        context_results = analyzer.find_error_context(search_term)
+        context_results = _cached_error_context(search_term)
         
         if context_results:
             st.write(f"Found {len(context_results)} matching log entries:")
@@ -3,9 +3,14 @@ New Analysis Tab Module
 Handles the main analysis interface for new speech uploads
 """
 
+import hashlib
+import os
+import time
+import traceback
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from ..ui_components import (
     render_upload_section, 
     render_paste_section, 
@@ -15,190 +20,29 @@ from ..ui_components import (
     render_sidebar_metadata_section,
     render_analysis_suggestions,
     render_chat_interface,
-    render_export_section
-)
-from ..enhanced_ui_components import (
-    render_info_card, render_success_card, render_warning_card, 
-    render_error_card, render_step_guide, render_loading_spinner,
-    render_tooltip_help, render_progress_bar
+    render_export_section,
+    cached_data_summary
 )
+from ..enhanced_ui_components import render_warning_card, render_progress_bar
+from .sdg_analysis_tab import forget_sdg_data
 from ...core.auth import validate_file_upload, check_rate_limit
-from ...data.simple_vector_storage import simple_vector_storage as db_manager
-
-
-def check_existing_data(country: str, year: int) -> Optional[Dict[str, Any]]:
-    """Check if data already exists for the given country and year."""
-    try:
-        # Query the database for existing speeches
-        query = """
-            SELECT id, country_name, year, speech_text, word_count, created_at
-            FROM speeches 
-            WHERE country_name = ? AND year = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        result = db_manager.conn.execute(query, [country, year]).fetchone()
-        
-        if result:
-            return {
-                'id': result[0],
-                'country': result[1],
-                'year': result[2],
-                'text': result[3],
-                'word_count': result[4],
-                'created_at': result[5]
-            }
-        return None
-    except Exception as e:
-        st.error(f"Error checking existing data: {e}")
-        return None
-
-
-def process_analysis(uploaded_file, pasted_text, country, speech_date, classification, model):
-    """
-    Comprehensive analysis workflow:
-    1. Check if speech exists in database
-    2. If exists, load from database
-    3. If not, extract text from file/paste
-    4. Translate to English if needed
-    5. Store in database
-    6. Run analysis
-    """
-    from ...data.data_ingestion import data_ingestion_manager
-    from ...core.llm import run_analysis
-    
-    try:
-        year = speech_date.year
-        
-        # Step 1: Check if speech already exists in database
-        with st.spinner("🔍 Checking if speech exists in database..."):
-            existing_data = check_existing_data(country, year)
-        
-        if existing_data:
-            st.success(f"✅ Speech found in database! Using existing data for {country} ({year})")
-            speech_text = existing_data['text']
-            word_count = existing_data['word_count']
-        else:
-            st.info("📝 Speech not found in database. Processing new speech...")
-            
-            # Step 2: Extract text from file or paste
-            with st.spinner("📄 Extracting text from source..."):
-                if uploaded_file:
-                    file_name = uploaded_file.name
-                    file_extension = file_name.split('.')[-1].lower()
-                    
-                    if file_extension in ['pdf']:
-                        # Extract from PDF
-                        from ...utils.file_processing import extract_text_from_pdf
-                        speech_text = extract_text_from_pdf(uploaded_file.getvalue())
-                    elif file_extension in ['docx', 'doc']:
-                        # Extract from DOCX
-                        from ...utils.file_processing import extract_text_from_docx
-                        speech_text = extract_text_from_docx(uploaded_file.getvalue())
-                    elif file_extension in ['mp3', 'wav', 'm4a']:
-                        # Extract from audio
-                        from ...utils.file_processing import extract_text_from_audio
-                        speech_text = extract_text_from_audio(uploaded_file.getvalue(), file_extension)
-                    elif file_extension in ['txt']:
-                        # Plain text
-                        speech_text = uploaded_file.getvalue().decode('utf-8')
-                    else:
-                        st.error(f"❌ Unsupported file type: {file_extension}")
-                        return None
-                else:
-                    # Use pasted text
-                    speech_text = pasted_text
-            
-            if not speech_text or len(speech_text.strip()) < 50:
-                st.error("❌ Extracted text is too short or empty. Please check your input.")
-                return None
-            
-            st.success(f"✅ Text extracted successfully ({len(speech_text)} characters)")
-            
-            # Step 3: Translate to English if needed
-            with st.spinner("🌐 Checking language and translating if needed..."):
-                try:
-                    from langdetect import detect
-                    detected_lang = detect(speech_text[:500])  # Check first 500 chars
-                    
-                    if detected_lang != 'en':
-                        st.info(f"🌐 Detected language: {detected_lang}. Translating to English...")
-                        from deep_translator import GoogleTranslator
-                        
-                        # Translate in chunks (Google Translator has limits)
-                        max_chunk_size = 4000
-                        translated_chunks = []
-                        
-                        for i in range(0, len(speech_text), max_chunk_size):
-                            chunk = speech_text[i:i+max_chunk_size]
-                            translated_chunk = GoogleTranslator(source=detected_lang, target='en').translate(chunk)
-                            translated_chunks.append(translated_chunk)
-                        
-                        speech_text = ' '.join(translated_chunks)
-                        st.success(f"✅ Text translated from {detected_lang} to English")
-                    else:
-                        st.success("✅ Text is already in English")
-                except Exception as e:
-                    st.warning(f"⚠️ Could not detect/translate language: {e}. Proceeding with original text.")
-            
-            # Calculate word count
-            word_count = len(speech_text.split())
-            
-            # Step 4: Store in database
-            with st.spinner("💾 Storing speech in database..."):
-                try:
-                    from ...data.data_ingestion import (
-                        COUNTRY_CODE_MAPPING,
-                        data_ingestion_manager,
-                        get_additional_region_groupings_for_code,
-                        get_regions_for_code,
-                    )
+from ...core.llm import run_analysis_stream, get_available_models
+from ...core.openai_client import get_openai_client
+from ...data.simple_vector_storage import simple_vector_storage as db_manager, text_sha256
+from ...data.ingest import extract_text_from_docx, extract_text_from_pdf
+from ...data.data_ingestion import (
+    NAME_TO_CODE,
+    data_ingestion_manager,
+    get_additional_region_groupings_for_code,
+    get_regions_for_code,
+    is_probably_english,
+    split_into_translation_chunks,
+    translate_chunks,
+)
 
-                    country_code = None
-                    for code, name in COUNTRY_CODE_MAPPING.items():
-                        if name == country:
-                            country_code = code
-                            break
-
-                    if not country_code:
-                        st.warning(f"⚠️ Could not find country code for {country}. Using default.")
-                        country_code = "UNK"
-
-                    region_list = get_regions_for_code(country_code)
-                    primary_region = region_list[0] if region_list else "Unknown"
-                    additional_regions = get_additional_region_groupings_for_code(country_code)
-                    is_african = data_ingestion_manager.is_african_member(country)
-
-                    metadata = {
-                        "country_code": country_code,
-                        "regions": {
-                            "primary": primary_region,
-                            "additional": additional_regions,
-                        },
-                        "ingested_via": "new_analysis_tab",
-                    }
-
-                    db_manager.save_speech_data(
-                        country_code=country_code,
-                        country_name=country,
-                        region=primary_region,
-                        session=year - 1945,
-                        year=year,
-                        speech_text=speech_text,
-                        source_filename=uploaded_file.name if uploaded_file else None,
-                        is_african_member=is_african,
-                        metadata=metadata,
-                    )
 
-                    st.success("✅ Speech stored in database for future use!")
-                except Exception as e:
-                    st.error(f"❌ Error storing in database: {e}")
-                    # Continue with analysis even if storage fails
-        
-        # Step 5: Run AI analysis
-        with st.spinner("🤖 Running AI analysis..."):
-            # Create sophisticated system and user messages for rich analysis
-            system_msg = """You are an expert analyst of UN General Assembly speeches with deep expertise in international relations, diplomacy, geopolitics, and policy analysis.
+# Sophisticated system and user messages for rich single-speech analysis
+_SYSTEM_MSG = """You are an expert analyst of UN General Assembly speeches with deep expertise in international relations, diplomacy, geopolitics, and policy analysis.
 
 ANALYSIS FRAMEWORK:
 You will analyze a single UNGA speech and provide a comprehensive, visually rich report that extracts maximum insight.
@@ -280,8 +124,8 @@ CRITICAL RULES:
 - Provide page/paragraph references when quoting
 - Bold all country names and organization names
 - Show relationships and connections, not just lists"""
-            
-            user_msg = f"""**SPEECH TO ANALYZE**
+
+_USER_TEMPLATE = """**SPEECH TO ANALYZE**
 
 **Country:** {country}
 **Year:** {year}
@@ -295,9 +139,469 @@ CRITICAL RULES:
 Provide a comprehensive, visually rich analysis following the exact structure and requirements specified in your instructions. Create tables, extract quotes, identify patterns, and deliver actionable insights.
 
 **Begin your structured analysis now:**"""
+
+
+# Latest stored speech for a (country, year); the statement text is built once
+# and DuckDB prepares and binds it per execute
+_SPEECH_META_SQL = """
+    SELECT id, word_count
+    FROM speeches
+    WHERE country_name = ? AND year = ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+_SPEECH_TEXT_SQL = "SELECT speech_text FROM speeches WHERE id = ?"
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_available_models() -> List[str]:
+    """Model list for the selector, cached so reruns do not refetch it."""
+    return get_available_models()
+
+
+# Seconds a stored-speech lookup is trusted before the database is asked again
+SPEECH_META_TTL = 300
+
+
+@st.cache_data(ttl=SPEECH_META_TTL, show_spinner=False, max_entries=512)
+def _speech_meta(country: str, year: int) -> Optional[Dict[str, Any]]:
+    """Id and word count of the latest stored speech, cached across reruns."""
+    # Only small columns are read; the speech text is loaded on demand
+    result = db_manager.conn.execute(_SPEECH_META_SQL, [country, year]).fetchone()
+    
+    if result:
+        return {'id': result[0], 'word_count': result[1]}
+    return None
+
+
+def check_existing_data(country: str, year: int) -> Optional[Dict[str, Any]]:
+    """Check if data already exists for the given country and year."""
+    # Pairs this session already found missing, with the time of the lookup
+    missing = st.session_state.setdefault('_missing_speech_keys', {})
+    checked_at = missing.get((country, year))
+    if checked_at is not None and time.monotonic() - checked_at < SPEECH_META_TTL:
+        return None
+    try:
+        result = _speech_meta(country, year)
+        if result is None:
+            missing[(country, year)] = time.monotonic()
+        return result
+    except Exception as e:
+        st.error(f"Error checking existing data: {e}")
+        return None
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def fetch_speech_text(speech_id: int) -> str:
+    """Text of a stored speech, loaded on demand for display."""
+    result = db_manager.conn.execute(_SPEECH_TEXT_SQL, [speech_id]).fetchone()
+    return result[0] if result else ''
+
+
+def forget_speech_lookups() -> None:
+    """Drop cached "not found" results, speech statistics and SDG data after a speech has been stored."""
+    _speech_meta.clear()
+    cached_data_summary.clear()
+    forget_sdg_data()
+    st.session_state.pop('_missing_speech_keys', None)
+
+
+def load_existing_speech(country: str, year: int) -> Optional[Dict[str, Any]]:
+    """Load the latest stored speech, including its text, for the given country and year."""
+    try:
+        meta = _speech_meta(country, year)
+        if not meta:
+            return None
+        
+        # The text is only read once an analysis starts, by primary key
+        result = db_manager.conn.execute(_SPEECH_TEXT_SQL, [meta['id']]).fetchone()
+        
+        if result:
+            return {
+                'id': meta['id'],
+                'country': country,
+                'year': year,
+                'text': result[0],
+                'word_count': meta['word_count']
+            }
+        return None
+    except Exception as e:
+        st.error(f"Error checking existing data: {e}")
+        return None
+
+
+def find_speech_by_hash(content_hash: str) -> Optional[Dict[str, Any]]:
+    """Find a stored speech whose original text has the given SHA-256."""
+    try:
+        result = db_manager.conn.execute("""
+            SELECT id, country_name, year, speech_text, word_count
+            FROM speeches
+            WHERE text_sha256 = ?
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, [content_hash]).fetchone()
+    except Exception as e:
+        st.warning(f"⚠️ Could not check for duplicate speeches: {e}")
+        return None
+    
+    if result:
+        return {
+            'id': result[0],
+            'country': result[1],
+            'year': result[2],
+            'text': result[3],
+            'word_count': result[4]
+        }
+    return None
+
+
+# Number of past analyses kept in session state
+MAX_ANALYSIS_HISTORY = 20
+
+# Fields of an analysis kept in the history
+HISTORY_FIELDS = ('analysis_id', 'speech_id', 'country', 'date', 'year',
+                  'classification', 'word_count', 'model', 'timestamp')
+
+# Seconds between checks on a running background analysis
+ANALYSIS_POLL_SECONDS = 2
+
+# st.fragment (Streamlit >= 1.37) lets the status panel refresh on its own
+FRAGMENT_AVAILABLE = hasattr(st, 'fragment')
+
+
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """Per-session executor that runs LLM calls off the script thread."""
+    if '_executor' not in st.session_state:
+        st.session_state['_executor'] = ThreadPoolExecutor(max_workers=2)
+    return st.session_state['_executor']
+
+
+def stream_analysis(chunks: List[str], **kwargs) -> str:
+    """Consume a streamed analysis into chunks as it arrives and return the full text."""
+    for piece in run_analysis_stream(**kwargs):
+        chunks.append(piece)
+    return "".join(chunks).strip()
+
+
+def _render_analysis_job_status():
+    """Show progress of a running analysis and rerun the app once it finishes."""
+    job = st.session_state.get('_analysis_job')
+    if not job:
+        return
+    if job['future'].done():
+        st.rerun()
+    
+    st.info(f"🤖 Running AI analysis for {job['country']} ({job['year']}) in the background...")
+    # Show the tokens received so far
+    partial = "".join(job['chunks'])
+    if partial:
+        st.markdown(partial)
+    if not FRAGMENT_AVAILABLE:
+        st.button("🔄 Check analysis status", key="new_analysis_check_status")
+
+
+if FRAGMENT_AVAILABLE:
+    _render_analysis_job_status = st.fragment(run_every=ANALYSIS_POLL_SECONDS)(_render_analysis_job_status)
+
+
+def collect_finished_analysis() -> None:
+    """Store the result of a finished background analysis, if there is one."""
+    job = st.session_state.get('_analysis_job')
+    if not job or not job['future'].done():
+        return
+    del st.session_state['_analysis_job']
+    
+    try:
+        analysis_result = job['future'].result()
+    except Exception as e:
+        st.error(f"❌ Error during analysis: {e}")
+        save_pending_speech(job)
+        return
+    
+    # DuckDB is not shared across threads, so the save happens here on the script thread
+    analysis_data = finalize_analysis(job, analysis_result)
+    if analysis_data:
+        remember_analysis(analysis_data)
+
+
+def remember_analysis(analysis_data: Dict[str, Any]) -> None:
+    """Make an analysis the current result and add it to the session history."""
+    # Add to analysis history, keeping only the most recent entries. The
+    # history is only listed in the sidebar, so it holds no analysis text
+    history = st.session_state.analysis_history
+    history.append({key: analysis_data.get(key) for key in HISTORY_FIELDS})
+    del history[:-MAX_ANALYSIS_HISTORY]
+    
+    # Store in session state for persistence across reruns
+    st.session_state.current_analysis_data = analysis_data
+
+
+def _upload_key(uploaded_file) -> Any:
+    """Stable identifier for an upload; a replaced file gets a new one even with the same name and size."""
+    return getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+
+
+def get_upload_bytes(uploaded_file) -> bytes:
+    """Read an uploaded file's bytes once and reuse them across reruns."""
+    key = _upload_key(uploaded_file)
+    cached = st.session_state.get('_upload_bytes')
+    if not cached or cached[0] != key:
+        # Only the current upload is kept, so earlier files are released
+        cached = (key, uploaded_file.getvalue())
+        st.session_state['_upload_bytes'] = cached
+    return cached[1]
+
+
+# Upload types whose text is extracted in the background as soon as they arrive
+PREFETCH_EXTENSIONS = ('pdf', 'docx', 'txt')
+
+# Extracted uploads kept per session, so uploading the same file again skips parsing
+MAX_EXTRACTED_UPLOADS = 4
+
+
+def upload_digest(uploaded_file) -> str:
+    """Content hash of the current upload, computed once per file."""
+    key = _upload_key(uploaded_file)
+    cached = st.session_state.get('_upload_digest')
+    if not cached or cached[0] != key:
+        # Hash the upload buffer in place; getbuffer() is a view, not a copy
+        digest = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+        cached = (key, digest)
+        st.session_state['_upload_digest'] = cached
+    return cached[1]
+
+
+def extract_document_text(file_bytes: bytes, file_extension: str) -> str:
+    """Text of an uploaded PDF, DOCX or plain text file."""
+    if file_extension == 'pdf':
+        return extract_text_from_pdf(file_bytes)
+    if file_extension == 'docx':
+        return extract_text_from_docx(file_bytes)
+    return file_bytes.decode('utf-8')
+
+
+def prefetch_upload_text(uploaded_file) -> None:
+    """Start extracting an upload's text while the user fills in the form."""
+    file_extension = uploaded_file.name.split('.')[-1].lower()
+    if file_extension not in PREFETCH_EXTENSIONS:
+        return
+    extractions = st.session_state.setdefault('_upload_text', {})
+    digest = upload_digest(uploaded_file)
+    if digest in extractions:
+        return
+    extractions[digest] = get_analysis_executor().submit(
+        extract_document_text, get_upload_bytes(uploaded_file), file_extension
+    )
+    # Keep only the most recent uploads
+    while len(extractions) > MAX_EXTRACTED_UPLOADS:
+        del extractions[next(iter(extractions))]
+
+
+def take_prefetched_text(uploaded_file) -> Optional[str]:
+    """Extracted text of the upload, waiting for a running extraction; None if not prefetched."""
+    extractions = st.session_state.get('_upload_text', {})
+    digest = upload_digest(uploaded_file)
+    future = extractions.get(digest)
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except Exception:
+        # Let the next attempt extract the file again
+        extractions.pop(digest, None)
+        raise
+
+
+def process_analysis(uploaded_file, pasted_text, country, speech_date, classification, model,
+                     file_bytes: Optional[bytes] = None, reuse_cached: bool = True):
+    """
+    Comprehensive analysis workflow:
+    1. Check if speech exists in database
+    2. If exists, load from database
+    3. If not, extract text from file/paste
+    4. Translate to English if needed
+    5. Prepare it for storage (saved together with the analysis)
+    6. Reuse a saved analysis of the same text, model and classification
+    7. Otherwise start the AI analysis in the background
+    
+    Returns True once the analysis is shown or its job has been submitted.
+    """
+    try:
+        year = speech_date.year
+        
+        # Step 1: Check if speech already exists in database
+        with st.spinner("🔍 Checking if speech exists in database..."):
+            existing_data = load_existing_speech(country, year)
+        
+        duplicate = None
+        if existing_data:
+            st.success(f"✅ Speech found in database! Using existing data for {country} ({year})")
+            speech_text = existing_data['text']
+            word_count = existing_data['word_count']
+            speech_record = None
+        else:
+            st.info("📝 Speech not found in database. Processing new speech...")
+            
+            # Step 2: Extract text from file or paste
+            with st.spinner("📄 Extracting text from source..."):
+                if uploaded_file:
+                    if file_bytes is None:
+                        file_bytes = get_upload_bytes(uploaded_file)
+                    file_name = uploaded_file.name
+                    file_extension = file_name.split('.')[-1].lower()
+                    # Usually already extracted in the background after upload
+                    prefetched_text = take_prefetched_text(uploaded_file)
+                    
+                    if prefetched_text is not None:
+                        speech_text = prefetched_text
+                    elif file_extension in ['pdf']:
+                        # Extract from PDF
+                        speech_text = extract_text_from_pdf(file_bytes)
+                    elif file_extension in ['docx', 'doc']:
+                        # Extract from DOCX
+                        speech_text = extract_text_from_docx(file_bytes)
+                    elif file_extension in ['mp3', 'wav', 'm4a']:
+                        # Extract from audio
+                        from ...utils.file_processing import extract_text_from_audio
+                        speech_text = extract_text_from_audio(file_bytes, file_extension)
+                    elif file_extension in ['txt']:
+                        # Plain text
+                        speech_text = file_bytes.decode('utf-8')
+                    else:
+                        st.error(f"❌ Unsupported file type: {file_extension}")
+                        return None
+                else:
+                    # Use pasted text
+                    speech_text = pasted_text
+            
+            if not speech_text or len(speech_text.strip()) < 50:
+                st.error("❌ Extracted text is too short or empty. Please check your input.")
+                return None
+            
+            st.success(f"✅ Text extracted successfully ({len(speech_text)} characters)")
+            
+            # An identical upload has already been translated and stored, so reuse it
+            content_hash = text_sha256(speech_text)
+            duplicate = find_speech_by_hash(content_hash)
+        
+        if duplicate:
+            st.success(f"✅ Identical speech already in database ({duplicate['country']}, {duplicate['year']}). Reusing stored text.")
+            speech_text = duplicate['text']
+            word_count = duplicate['word_count'] or len(speech_text.split())
+            speech_record = None
+        elif not existing_data:
+            # Step 3: Translate to English if needed
+            with st.spinner("🌐 Checking language and translating if needed..."):
+                try:
+                    if is_probably_english(speech_text):
+                        # Most speeches are English; skip the slow classifier
+                        detected_lang = 'en'
+                    else:
+                        # Profiles are preloaded at startup by prewarm_language_detection
+                        from langdetect import detect
+                        detected_lang = detect(speech_text[:500])  # Check first 500 chars
+                    
+                    if detected_lang != 'en':
+                        st.info(f"🌐 Detected language: {detected_lang}. Translating to English...")
+                        
+                        # Translate in sentence-aligned chunks (Google Translator
+                        # has limits), several requests at a time
+                        chunks = split_into_translation_chunks(speech_text)
+                        
+                        progress_placeholder = st.empty()
+                        
+                        def show_progress(completed: int, total: int) -> None:
+                            with progress_placeholder.container():
+                                render_progress_bar(completed, total, "Translating")
+                        
+                        translated_chunks = translate_chunks(chunks, detected_lang, on_progress=show_progress)
+                        progress_placeholder.empty()
+                        
+                        speech_text = ' '.join(translated_chunks)
+                        st.success(f"✅ Text translated from {detected_lang} to English")
+                    else:
+                        st.success("✅ Text is already in English")
+                except Exception as e:
+                    st.warning(f"⚠️ Could not detect/translate language: {e}. Proceeding with original text.")
+            
+            # Calculate word count once; it is stored with the speech as well
+            word_count = len(speech_text.split())
+            
+            # Step 4: Prepare the speech for storage; it is written together
+            # with the analysis in one transaction once the analysis finishes
+            country_code = NAME_TO_CODE.get(country)
+
+            if not country_code:
+                st.warning(f"⚠️ Could not find country code for {country}. Using default.")
+                country_code = "UNK"
+
+            region_list = get_regions_for_code(country_code)
+            primary_region = region_list[0] if region_list else "Unknown"
+            additional_regions = get_additional_region_groupings_for_code(country_code)
+            is_african = data_ingestion_manager.is_african_member(country)
+
+            metadata = {
+                "country_code": country_code,
+                "regions": {
+                    "primary": primary_region,
+                    "additional": additional_regions,
+                },
+                "ingested_via": "new_analysis_tab",
+            }
+
+            speech_record = {
+                'country_code': country_code,
+                'country_name': country,
+                'region': primary_region,
+                'session': year - 1945,
+                'year': year,
+                'speech_text': speech_text,
+                'source_filename': uploaded_file.name if uploaded_file else None,
+                'is_african_member': is_african,
+                'metadata': metadata,
+                'content_hash': content_hash,
+                'word_count': word_count,
+            }
+        
+        job = {
+            'country': country,
+            'speech_date': speech_date,
+            'year': year,
+            'classification': classification,
+            'word_count': word_count,
+            'model': model,
+            'speech_text': speech_text,
+            'source_filename': uploaded_file.name if uploaded_file else "pasted_text",
+            'speech_record': speech_record,
+            # Set when the speech is already stored; analyses then refer to it by id
+            'speech_id': (existing_data or duplicate or {}).get('id'),
+            # Hash of the analysed (translated) text, stored with the analysis
+            'content_hash': text_sha256(speech_text),
+        }
+        
+        # Step 5: Reuse an earlier analysis instead of calling the model again
+        if reuse_cached:
+            cached = db_manager.find_analysis(job['content_hash'], model, classification)
+            if cached:
+                st.success(f"♻️ Reusing saved analysis (ID: {cached['id']}) of this speech with {model}.")
+                save_pending_speech(job)
+                analysis_data = build_analysis_data(job, cached['output_markdown'])
+                analysis_data['analysis_id'] = cached['id']
+                remember_analysis(analysis_data)
+                return True
+        
+        # Step 6: Run AI analysis
+        with st.spinner("🤖 Running AI analysis..."):
+            # Fill the user message template; the system message is a module constant
+            user_msg = _USER_TEMPLATE.format_map({
+                'country': country,
+                'year': year,
+                'word_count': word_count,
+                'classification': classification,
+                'speech_text': speech_text,
+            })
             
             # Get Azure OpenAI client
-            from ...core.openai_client import get_openai_client
             client = get_openai_client()
             
             if not client:
@@ -305,55 +609,121 @@ Provide a comprehensive, visually rich analysis following the exact structure an
                 return None
             
             # Use the deployment name from environment or selected model
-            import os
             deployment_name = os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME', model)
             st.info(f"🤖 Using AI deployment: {deployment_name}")
             
-            analysis_result = run_analysis(
-                system_msg=system_msg,
+            # Run the LLM call off the script thread so the UI stays responsive;
+            # the result is collected by collect_finished_analysis on a later rerun
+            # The response is streamed into chunks so the status panel can
+            # show it while it is being generated
+            chunks: List[str] = []
+            future = get_analysis_executor().submit(
+                stream_analysis,
+                chunks,
+                system_msg=_SYSTEM_MSG,
                 user_msg=user_msg,
                 model=deployment_name,  # Use the actual deployment name
                 client=client
             )
+            job['future'] = future
+            job['chunks'] = chunks
+            st.session_state['_analysis_job'] = job
         
-        if not analysis_result:
-            st.error("❌ Analysis failed. Please try again.")
-            return None
+        return True
         
+    except Exception as e:
+        st.error(f"❌ Error during analysis: {e}")
+        st.error(traceback.format_exc())
+        return False
+
+
+def save_pending_speech(job: Dict[str, Any]) -> None:
+    """Store a newly extracted speech on its own, e.g. when its analysis failed."""
+    if not job.get('speech_record'):
+        return
+    try:
+        job['speech_id'] = db_manager.save_speech_data(**job['speech_record'])
+        # The speech now exists, so drop any cached "not found" result
+        forget_speech_lookups()
+        st.success("✅ Speech stored in database for future use!")
+    except Exception as e:
+        st.error(f"❌ Error storing in database: {e}")
+
+
+def build_analysis_data(job: Dict[str, Any], output_markdown: str) -> Dict[str, Any]:
+    """Session record of an analysis, as shown by render_analysis_results."""
+    analysis_data = {
+        'country': job['country'],
+        'date': job['speech_date'].isoformat(),
+        'year': job['year'],
+        'classification': job['classification'],
+        'word_count': job['word_count'],
+        'model': job['model'],
+        'output_markdown': output_markdown,
+        'speech_id': job.get('speech_id'),
+        'timestamp': datetime.now().isoformat()
+    }
+    if not analysis_data['speech_id']:
+        # Not stored (yet), so the session has to keep the text itself
+        analysis_data['full_text'] = job['speech_text']
+    return analysis_data
+
+
+def finalize_analysis(job: Dict[str, Any], analysis_result: str) -> Optional[Dict[str, Any]]:
+    """Build the analysis record for a finished job and save it to the database."""
+    country = job['country']
+    speech_date = job['speech_date']
+    year = job['year']
+    classification = job['classification']
+    word_count = job['word_count']
+    model = job['model']
+    speech_text = job['speech_text']
+    
+    if not analysis_result:
+        st.error("❌ Analysis failed. Please try again.")
+        save_pending_speech(job)
+        return None
+    
+    speech_record = job.get('speech_record')
+    
+    try:
         # Prepare analysis data
-        analysis_data = {
-            'country': country,
-            'date': speech_date.isoformat(),
-            'year': year,
-            'classification': classification,
-            'word_count': word_count,
-            'model': model,
-            'output_markdown': analysis_result,
-            'speech_text': speech_text[:1000] + "..." if len(speech_text) > 1000 else speech_text,  # Store excerpt
-            'full_text': speech_text,
-            'timestamp': datetime.now().isoformat()
-        }
+        analysis_data = build_analysis_data(job, analysis_result)
         
-        # Step 6: Save analysis to database for "All Analyses" tab
+        # Step 6: Save the new speech (if any) and the analysis for the
+        # "All Analyses" tab in a single transaction
         with st.spinner("💾 Saving analysis to database..."):
             try:
-                analysis_id = db_manager.save_analysis(
-                    country=country,
-                    classification=classification,
-                    raw_text=speech_text,
-                    output_markdown=analysis_result,
-                    prompt_used=f"Analysis of {country} ({year}) speech",
-                    sdgs=None,  # Could be extracted from analysis if needed
-                    africa_mentioned=None,  # Could be detected from analysis
-                    speech_date=speech_date.isoformat(),
-                    source_filename=uploaded_file.name if uploaded_file else "pasted_text",
-                    metadata={
-                        'model': model,
-                        'word_count': word_count,
-                        'year': year,
-                        'analysis_type': 'single_speech'
-                    }
-                )
+                with db_manager.transaction():
+                    if speech_record:
+                        speech_id = db_manager.save_speech_data(**speech_record)
+                    analysis_id = db_manager.save_analysis(
+                        country=country,
+                        classification=classification,
+                        raw_text=speech_text,
+                        output_markdown=analysis_result,
+                        prompt_used=f"Analysis of {country} ({year}) speech",
+                        sdgs=None,  # Could be extracted from analysis if needed
+                        africa_mentioned=None,  # Could be detected from analysis
+                        speech_date=speech_date.isoformat(),
+                        source_filename=job['source_filename'],
+                        metadata={
+                            'model': model,
+                            'word_count': word_count,
+                            'year': year,
+                            'analysis_type': 'single_speech'
+                        },
+                        model=model,
+                        content_hash=job.get('content_hash')
+                    )
+                
+                if speech_record:
+                    # The speech now exists, so drop any cached "not found" result
+                    forget_speech_lookups()
+                    # and the session only needs to remember its id
+                    analysis_data['speech_id'] = speech_id
+                    analysis_data.pop('full_text', None)
+                    st.success("✅ Speech stored in database for future use!")
                 
                 analysis_data['analysis_id'] = analysis_id
                 st.success(f"✅ Analysis saved to database (ID: {analysis_id}) and available in 'All Analyses' tab!")
@@ -366,7 +736,6 @@ Provide a comprehensive, visually rich analysis following the exact structure an
         
     except Exception as e:
         st.error(f"❌ Error during analysis: {e}")
-        import traceback
         st.error(traceback.format_exc())
         return None
 
@@ -374,11 +743,17 @@ Provide a comprehensive, visually rich analysis following the exact structure an
 def render_new_analysis_tab():
     """Render the enhanced new analysis tab."""
     # Initialize session state
-    if 'analysis_history' not in st.session_state:
-        st.session_state.analysis_history = []
+    st.session_state.setdefault('analysis_history', [])
+    
+    # Pick up a background analysis that has finished since the last rerun
+    collect_finished_analysis()
+    analysis_running = '_analysis_job' in st.session_state
+    if analysis_running:
+        # Only a running job needs the polling status panel
+        _render_analysis_job_status()
     
     # Add "Start New Analysis" button if there are existing results
-    if 'current_analysis_data' in st.session_state and st.session_state.current_analysis_data:
+    if st.session_state.get('current_analysis_data'):
         if st.button("➕ Start New Analysis", type="secondary", use_container_width=True, key="new_analysis_reset"):
             # Clear current analysis
             st.session_state.current_analysis_data = None
@@ -405,63 +780,80 @@ def render_new_analysis_tab():
         )
         return
     
-    # Validate file if uploaded
+    # Validate file if uploaded, then start extracting its text
     if uploaded_file:
-        if not validate_file_upload(uploaded_file.getvalue(), uploaded_file.name):
+        if not validate_file_upload(uploaded_file.size, uploaded_file.name):
             st.error("❌ Invalid file. Please check file size and type.")
             return
+        prefetch_upload_text(uploaded_file)
     
     # Country and metadata selection
     st.markdown("---")
     st.markdown("### 🏷️ Speech Information")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        country = render_country_selection()
-    
-    with col2:
-        speech_date = render_speech_date_selection()
-    
-    with col3:
-        classification = render_classification_selection(country)
-    
-    # Check for existing data if country and year are selected
-    existing_data = None
-    if country and speech_date:
-        year = speech_date.year
-        existing_data = check_existing_data(country, year)
+    # The fields are committed together, so filling them in costs one rerun;
+    # Start submits the form too, so it always sees the values on screen
+    with st.form("speech_info_form", clear_on_submit=False):
+        col1, col2, col3 = st.columns(3)
         
-        if existing_data:
-            st.info(f"ℹ️ **Note:** Speech for {country} ({year}) already exists in database ({existing_data['word_count']:,} words). Click 'Start Analysis' to analyze it.")
-    
-    # Model selection
-    st.markdown("### 🤖 AI Model Selection")
-    from ...core.llm import get_available_models
-    available_models = get_available_models()
-    
-    if available_models:
-        model = st.selectbox(
-            "Choose AI Model:",
-            options=available_models,
-            key="new_analysis_model_select",
-            index=0,
-            help="Select the AI model for analysis"
+        with col1:
+            country = render_country_selection()
+        
+        with col2:
+            speech_date = render_speech_date_selection()
+        
+        with col3:
+            classification = render_classification_selection(country, key="new_analysis_classification")
+        
+        # Check for existing data if country and year are selected
+        existing_data = None
+        if country and speech_date:
+            year = speech_date.year
+            existing_data = check_existing_data(country, year)
+            
+            if existing_data:
+                st.info(f"ℹ️ **Note:** Speech for {country} ({year}) already exists in database ({existing_data['word_count']:,} words). Click 'Start Analysis' to analyze it.")
+        
+        # Model selection
+        st.markdown("### 🤖 AI Model Selection")
+        available_models = _cached_available_models()
+        
+        if available_models:
+            model = st.selectbox(
+                "Choose AI Model:",
+                options=available_models,
+                key="new_analysis_model_select",
+                index=0,
+                help="Select the AI model for analysis"
+            )
+        else:
+            model = "model-router-osaa-2"
+            st.warning("⚠️ Using default model. AI service may not be available.")
+        
+        reuse_cached = st.checkbox(
+            "♻️ Use saved analysis if available (free)",
+            value=True,
+            key="new_analysis_reuse_cached",
+            help="Reuse an earlier analysis of the same speech text with the same model and classification. Untick to re-run the AI analysis."
         )
-    else:
-        model = "model-router-osaa-2"
-        st.warning("⚠️ Using default model. AI service may not be available.")
-    
-    # Analysis button
-    st.markdown("---")
-    
-    # Check rate limit
-    user_id = st.session_state.get('user_id', 'anonymous')
-    if not check_rate_limit(user_id):
-        st.error("❌ Rate limit exceeded. Please wait before making another request.")
-        return
+        
+        # Analysis button
+        st.markdown("---")
+        
+        apply_col, start_col = st.columns([1, 2])
+        with apply_col:
+            st.form_submit_button("✅ Apply", use_container_width=True)
+        with start_col:
+            start_clicked = st.form_submit_button("🚀 Start Analysis", type="primary", use_container_width=True,
+                                                  disabled=analysis_running)
     
-    if st.button("🚀 Start Analysis", type="primary", use_container_width=True, key="new_analysis_start"):
+    if start_clicked:
+        # Check rate limit; each check counts as a request, so only on Start
+        user_id = st.session_state.get('user_id', 'anonymous')
+        if not check_rate_limit(user_id):
+            st.error("❌ Rate limit exceeded. Please wait before making another request.")
+            return
+        
         if not country:
             st.error("❌ Please select a country name.")
             return
@@ -471,27 +863,27 @@ def render_new_analysis_tab():
             return
         
         # Process the analysis
-        analysis_data = process_analysis(
+        started = process_analysis(
             uploaded_file=uploaded_file,
             pasted_text=pasted_text,
             country=country,
             speech_date=speech_date,
             classification=classification,
-            model=model
+            model=model,
+            reuse_cached=reuse_cached
         )
         
-        if analysis_data:
-            # Add to analysis history
-            st.session_state.analysis_history.append(analysis_data)
-            
-            # Store in session state for persistence across reruns
-            st.session_state.current_analysis_data = analysis_data
+        if started:
+            if '_analysis_job' in st.session_state:
+                # Rerun so the job's status panel is shown once, at the top of the tab
+                st.rerun()
         else:
             st.error("❌ Analysis failed. Please try again.")
     
     # Display analysis results if they exist (even after rerun)
-    if 'current_analysis_data' in st.session_state and st.session_state.current_analysis_data:
-        render_analysis_results(st.session_state.current_analysis_data)
+    current_analysis = st.session_state.get('current_analysis_data')
+    if current_analysis:
+        render_analysis_results(current_analysis)
     
     # Render sidebar metadata
     render_sidebar_metadata_section(uploaded_file, pasted_text)
@@ -502,46 +894,45 @@ def render_analysis_results(analysis_data: Dict[str, Any]):
     st.markdown("---")
     st.markdown("## 📊 Analysis Results")
     
-    # Display basic info
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("🏳️ Country", analysis_data['country'])
-    with col2:
-        st.metric("📅 Date", analysis_data['date'])
-    with col3:
-        st.metric("🏷️ Classification", analysis_data['classification'])
-    with col4:
-        st.metric("📝 Word Count", f"{analysis_data['word_count']:,}")
-    
-    # Display the speech text in a downloadable text box
-    st.markdown("### 📄 Original Speech Text")
+    # Display basic info as one table rather than four metric widgets
+    st.markdown(
+        "| 🏳️ Country | 📅 Date | 🏷️ Classification | 📝 Word Count |\n"
+        "|---|---|---|---|\n"
+        f"| {analysis_data['country']} | {analysis_data['date']} | "
+        f"{analysis_data['classification']} | {analysis_data['word_count']:,} |"
+    )
     
-    # Get the full speech text
-    speech_text = analysis_data.get('full_text', analysis_data.get('speech_text', ''))
+    # Get the full speech text; stored speeches are only referenced by id
+    speech_text = analysis_data.get('full_text')
+    if speech_text is None:
+        speech_id = analysis_data.get('speech_id')
+        speech_text = fetch_speech_text(speech_id) if speech_id else ''
     
-    col1, col2 = st.columns([4, 1])
-    with col1:
-        st.text_area(
-            "Speech Content:",
-            value=speech_text,
-            height=300,
-            key="speech_text_display",
-            help="Original speech text - you can copy or download this"
-        )
+    # Keep the (possibly very long) speech collapsed so results render first
+    with st.expander("📄 Show original speech", expanded=False):
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.text_area(
+                "Speech Content:",
+                value=speech_text,
+                height=300,
+                key="speech_text_display",
+                help="Original speech text - you can copy or download this"
+            )
     
-    with col2:
-        # Download button
-        st.markdown("<br>", unsafe_allow_html=True)  # Spacing
-        st.download_button(
-            label="📥 Download Speech",
-            data=speech_text,
-            file_name=f"{analysis_data['country']}_{analysis_data['year']}_speech.txt",
-            mime="text/plain",
-            use_container_width=True
-        )
+        with col2:
+            # Download button
+            st.markdown("<br>", unsafe_allow_html=True)  # Spacing
+            st.download_button(
+                label="📥 Download Speech",
+                data=speech_text,
+                file_name=f"{analysis_data['country']}_{analysis_data['year']}_speech.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
         
-        # Copy to clipboard info
-        st.info("💡 You can also select and copy text from the box")
+            # Copy to clipboard info
+            st.info("💡 You can also select and copy text from the box")
     
     # Display the analysis
     st.markdown("---")
@@ -553,7 +944,7 @@ def render_analysis_results(analysis_data: Dict[str, Any]):
     render_analysis_suggestions(analysis_data['country'], analysis_data['classification'])
     
     # Chat interface
-    render_chat_interface(
+    _render_results_chat(
         analysis_data['output_markdown'],
         analysis_data['country'],
         analysis_data['classification']
@@ -564,3 +955,12 @@ def render_analysis_results(analysis_data: Dict[str, Any]):
     
     # Store in session state for other tabs
     st.session_state.current_analysis = analysis_data
+
+
+def _render_results_chat(analysis_context: str, country: str, classification: str):
+    """Follow-up chat on an analysis; as a fragment, asking a question only reruns the chat."""
+    render_chat_interface(analysis_context, country, classification)
+
+
+if FRAGMENT_AVAILABLE:
+    _render_results_chat = st.fragment(_render_results_chat)
@@ -8,9 +8,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
+import hashlib
+import json
+import logging
 import numpy as np
 
 from ...data.simple_vector_storage import simple_vector_storage as db_manager
@@ -25,6 +29,8 @@ from ...core.llm import run_analysis, get_available_models
 from ...core.openai_client import get_openai_client
 from ...utils.sdg_visualizations import SDG_KEYWORDS
 
+logger = logging.getLogger(__name__)
+
 # Official SDG Colors and Icons
 SDG_INFO = {
     "SDG 1: No Poverty": {"color": "#E5243B", "icon": "🏚️"},
@@ -46,6 +52,87 @@ SDG_INFO = {
     "SDG 17: Partnerships": {"color": "#19486A", "icon": "🤝"}
 }
 
+# Goal names (a list, so pandas treats it as a column selection), colours
+# and icons in SDG order
+SDG_NAMES: List[str] = list(SDG_INFO)
+SDG_COLORS: Tuple[str, ...] = tuple(info["color"] for info in SDG_INFO.values())
+SDG_ICONS: Tuple[str, ...] = tuple(info["icon"] for info in SDG_INFO.values())
+
+
+def _sql_string(value: str) -> str:
+    """Quote a constant as a SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+# One column per goal, computed inside DuckDB from the lowercased speech text:
+# the number of the goal's keywords that occur in the speech
+SDG_COUNT_COLUMNS_SQL = ",\n".join(
+    "(" + " + ".join(
+        f"contains(lowered, {_sql_string(keyword.lower())})::INTEGER"
+        for keyword in sdg_data["keywords"]
+    ) + f') AS "{sdg_name}"'
+    for sdg_name, sdg_data in SDG_KEYWORDS.items()
+)
+
+# Per-speech SDG counts are materialised once into this narrow table and
+# rebuilt when the keywords or the set of stored speeches change
+SDG_COUNTS_TABLE = "speeches_sdg_counts"
+SDG_COUNTS_VERSION_TABLE = "speeches_sdg_counts_version"
+SDG_KEYWORDS_VERSION = hashlib.sha256(
+    json.dumps(SDG_KEYWORDS, sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+
+def refresh_sdg_counts() -> None:
+    """Rebuild the SDG count table if its keywords or source speeches are out of date."""
+    conn = db_manager.conn
+
+    # Other sessions' writes wait, and a concurrent refresh finds the table current
+    with db_manager.transaction():
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {SDG_COUNTS_VERSION_TABLE} (version VARCHAR)")
+        speech_count, max_speech_id = conn.execute("SELECT count(*), max(id) FROM speeches").fetchone()
+        version = f"{SDG_KEYWORDS_VERSION}:{speech_count}:{max_speech_id}"
+        current = conn.execute(f"SELECT version FROM {SDG_COUNTS_VERSION_TABLE}").fetchone()
+        if current and current[0] == version:
+            return
+
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE {SDG_COUNTS_TABLE} AS
+            SELECT country_name, year, region, word_count,
+                   {SDG_COUNT_COLUMNS_SQL}
+            FROM (
+                SELECT country_name, year, region, word_count, lower(speech_text) AS lowered
+                FROM speeches
+                WHERE speech_text IS NOT NULL AND speech_text <> ''
+            )
+        """)
+        conn.execute(f"DELETE FROM {SDG_COUNTS_VERSION_TABLE}")
+        conn.execute(f"INSERT INTO {SDG_COUNTS_VERSION_TABLE} VALUES (?)", [version])
+    logger.info(f"Rebuilt {SDG_COUNTS_TABLE} ({speech_count} speeches)")
+
+
+def forget_sdg_data() -> None:
+    """Drop cached SDG data and figures after a speech has been stored."""
+    speech_countries.clear()
+    _load_sdg_data.clear()
+    _build_trend_figs.clear()
+    _build_profile_figs.clear()
+
+
+def _sum_sdg_counts(df: pd.DataFrame, key: str, sdg_cols: List[str], sort: bool = False) -> pd.DataFrame:
+    """Sum SDG count columns per value of ``key`` with one scatter-add instead of a groupby."""
+    codes, groups = pd.factorize(df[key], sort=sort)
+    present = codes >= 0
+    totals = np.zeros((len(groups), len(sdg_cols)), dtype=np.int64)
+    np.add.at(totals, codes[present], df[sdg_cols].to_numpy(dtype=np.int64)[present])
+    return pd.DataFrame(totals, index=pd.Index(groups, name=key), columns=sdg_cols)
+
+
+def _context_table(summary: pd.DataFrame, max_rows: int = 20) -> str:
+    """Format SDG totals as a compact CSV table for an LLM prompt, dropping empty SDGs."""
+    nonzero = summary.loc[:, (summary != 0).any()]
+    return nonzero.head(max_rows).round(0).astype(int).to_csv()
+
 
 def get_sdg_analysis_questions() -> Dict[str, List[str]]:
     """Get SDG-specific analysis questions organized by category."""
@@ -117,77 +204,113 @@ def get_sdg_analysis_questions() -> Dict[str, List[str]]:
     }
 
 
-def get_sdg_data(year_range: tuple = (2015, 2025), countries: Optional[List[str]] = None, regions: Optional[List[str]] = None) -> pd.DataFrame:
-    """Get SDG-related speech data from database."""
-    try:
-        countries = countries or []
-        regions = regions or []
+@st.cache_resource(show_spinner=False)
+def region_lookup() -> Dict[str, List[str]]:
+    """Country name -> region labels, built once and shared read-only."""
+    return get_country_region_lookup()
 
-        country_region_lookup = get_country_region_lookup()
 
-        selected_countries: Set[str] = set(countries)
+@st.cache_resource(show_spinner=False)
+def region_members() -> Dict[str, frozenset]:
+    """Region label -> countries carrying it, the reverse of region_lookup()."""
+    members: Dict[str, Set[str]] = {}
+    for country_name, labels in region_lookup().items():
+        for label in labels:
+            members.setdefault(label, set()).add(country_name)
+    return {label: frozenset(countries) for label, countries in members.items()}
 
-        if regions:
-            for country_name, labels in country_region_lookup.items():
-                if any(region in labels for region in regions):
-                    selected_countries.add(country_name)
 
-        where_conditions = ["year >= ?", "year <= ?", "speech_text IS NOT NULL"]
-        params = [year_range[0], year_range[1]]
-        
-        if selected_countries:
-            placeholders = ','.join(['?' for _ in selected_countries])
-            where_conditions.append(f"country_name IN ({placeholders})")
-            params.extend(sorted(selected_countries))
-        
-        query = f"""
-            SELECT country_name, year, speech_text, region, word_count
-            FROM speeches
-            WHERE {' AND '.join(where_conditions)}
-            ORDER BY year DESC, country_name
-        """
-        
-        results = db_manager.conn.execute(query, params).fetchall()
-        
-        data = []
-        for row in results:
-            country, year, text, region, word_count = row
-            if text:
-                # Count SDG mentions for each goal
-                sdg_counts = {}
-                for sdg_name, sdg_data in SDG_KEYWORDS.items():
-                    keywords = sdg_data["keywords"]
-                    count = sum(1 for keyword in keywords if keyword.lower() in text.lower())
-                    sdg_counts[sdg_name] = count
-                
-                regions_for_country = country_region_lookup.get(country, [])
-                primary_region = regions_for_country[0] if regions_for_country else (region or 'Unknown')
-                data.append({
-                    'country': country,
-                    'year': year,
-                    'region': primary_region,
-                    'regions': regions_for_country,
-                    'word_count': word_count or 0,
-                    **sdg_counts
-                })
-
-        df = pd.DataFrame(data)
-
-        if not df.empty and regions:
-            df = df[df['regions'].apply(lambda labels: any(region in labels for region in regions))]
-        
-        return df
-    
+@st.cache_resource(show_spinner=False)
+def region_options() -> List[str]:
+    """Region labels offered in the region filters."""
+    return [label for label in get_all_region_labels() if label and label != "Unknown"]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def speech_countries() -> List[str]:
+    """Countries with at least one stored speech, for the country pickers."""
+    rows = db_manager.conn.execute(
+        "SELECT DISTINCT country_name FROM speeches ORDER BY country_name"
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_sdg_data(year_range: tuple = (2015, 2025), countries: Optional[List[str]] = None, regions: Optional[List[str]] = None) -> pd.DataFrame:
+    """Get SDG-related speech data from database."""
+    try:
+        # Sorted tuples so the same filters always hit the same cache entry
+        return _load_sdg_data(
+            tuple(year_range),
+            tuple(sorted(set(countries or []))),
+            tuple(sorted(set(regions or []))),
+        )
     except Exception as e:
         st.error(f"Error fetching SDG data: {e}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _load_sdg_data(year_range: tuple, countries: tuple, regions: tuple) -> pd.DataFrame:
+    """Speeches in the filters with their per-goal keyword counts, cached per filter set."""
+    country_region_lookup = region_lookup()
+
+    # Countries belonging to any of the selected regions
+    members = region_members()
+    region_countries: Set[str] = set().union(
+        *(members[region] for region in regions if region in members)
+    )
+
+    selected_countries: Set[str] = set(countries) | region_countries
+
+    where_conditions = ["year >= ?", "year <= ?"]
+    params = [year_range[0], year_range[1]]
+
+    if selected_countries:
+        # One list parameter, so the statement text is the same for any number of countries
+        where_conditions.append("list_contains(?::VARCHAR[], country_name)")
+        params.append(sorted(selected_countries))
+
+    # Keyword counts are precomputed in DuckDB (refresh_sdg_counts, run when
+    # the tab renders), so no speech text is scanned here
+    sdg_columns = ", ".join(f'"{sdg_name}"' for sdg_name in SDG_KEYWORDS)
+    query = f"""
+        SELECT country_name AS country, year, region, word_count, {sdg_columns}
+        FROM {SDG_COUNTS_TABLE}
+        WHERE {' AND '.join(where_conditions)}
+        ORDER BY year DESC, country_name
+    """
+
+    df = db_manager.conn.execute(query, params).fetch_df()
+
+    # Primary region from the region lookup, falling back to the stored one
+    primary_regions = {
+        country_name: labels[0] for country_name, labels in country_region_lookup.items() if labels
+    }
+    df['region'] = df['country'].map(primary_regions).fillna(df['region']).fillna('Unknown')
+    df['word_count'] = df['word_count'].fillna(0).astype(int)
+
+    if not df.empty and regions:
+        df = df[df['country'].isin(region_countries)]
+
+    # Repeated labels as categoricals and small counts as int32 keep the
+    # cached frame compact and let groupbys work on integer codes
+    df = df.astype({'country': 'category', 'region': 'category'})
+    df[SDG_NAMES] = df[SDG_NAMES].astype(np.int32)
+
+    return df
+
+
 def render_sdg_analysis_tab():
     """Main function to render the SDG Analysis tab."""
     st.header("🌍 SDG Analysis Dashboard")
     st.markdown("**Track Sustainable Development Goals discourse across UNGA speeches (2015-2025) • 17 Goals • 2030 Agenda Progress**")
     
+    # Bring the SDG count table up to date before any cached loader reads it
+    try:
+        refresh_sdg_counts()
+    except Exception as e:
+        logger.error(f"Could not refresh {SDG_COUNTS_TABLE}: {e}")
+    
     # SDG Overview Banner
     st.markdown("---")
     col1, col2, col3, col4 = st.columns(4)
@@ -257,7 +380,7 @@ def render_quick_sdg_analysis():
         with col2:
             regions_filter = st.multiselect(
                 "🌍 Regions:",
-                [label for label in get_all_region_labels() if label and label != "Unknown"],
+                region_options(),
                 key="sdg_quick_regions",
                 help="Choose any region grouping (including sub-regions) to focus the analysis."
             )
@@ -278,7 +401,7 @@ def render_advanced_sdg_trends():
     with col1:
         selected_sdgs = st.multiselect(
             "🎯 Select SDGs to Compare:",
-            options=list(SDG_INFO.keys()),
+            options=SDG_NAMES,
             default=["SDG 13: Climate Action", "SDG 5: Gender Equality", "SDG 1: No Poverty"],
             key="sdg_advanced_selection"
         )
@@ -293,7 +416,7 @@ def render_advanced_sdg_trends():
     with col3:
         regions_filter = st.multiselect(
             "🌍 Regions:",
-            [label for label in get_all_region_labels() if label and label != "Unknown"],
+            region_options(),
             key="sdg_advanced_regions",
             help="Optional: restrict the visualization to selected regions."
         )
@@ -311,10 +434,7 @@ def render_country_sdg_profiles():
     
     with col1:
         # Get available countries
-        countries_query = db_manager.conn.execute(
-            "SELECT DISTINCT country_name FROM speeches ORDER BY country_name"
-        ).fetchall()
-        available_countries = [c[0] for c in countries_query]
+        available_countries = speech_countries()
         
         # Set default countries only if they exist in the list
         default_countries = []
@@ -372,15 +492,12 @@ def render_custom_sdg_query():
 
     regions_filter = st.multiselect(
         "🌍 Regions:",
-        [label for label in get_all_region_labels() if label and label != "Unknown"],
+        region_options(),
         key="sdg_custom_regions",
         help="Select regions to focus the analysis. Leave empty to analyze all regions."
     )
 
-    countries_query = db_manager.conn.execute(
-        "SELECT DISTINCT country_name FROM speeches ORDER BY country_name"
-    ).fetchall()
-    available_countries = [row[0] for row in countries_query]
+    available_countries = speech_countries()
 
     countries_filter = st.multiselect(
         "🌐 Countries:",
@@ -396,6 +513,12 @@ def render_custom_sdg_query():
             st.warning("Please enter a question")
 
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def cached_sdg_answer(system_msg: str, user_msg: str, model: str) -> str:
+    """LLM answer for an SDG prompt, reused when the same prompt and model come back."""
+    return run_analysis(system_msg, user_msg, model=model, client=get_openai_client())
+
+
 def perform_sdg_analysis(question: str, year_range: tuple, regions: List[str] = None):
     """Perform SDG analysis using AI."""
     try:
@@ -425,11 +548,8 @@ def perform_sdg_analysis(question: str, year_range: tuple, regions: List[str] =
         - Total Speeches Analyzed: {len(df)}
         - Countries: {df['country'].nunique()}
         
-        SDG Summary Data:
-        {df[list(SDG_INFO.keys())].sum().to_dict()}
-        
         Top SDGs by Total Mentions:
-        {df[list(SDG_INFO.keys())].sum().sort_values(ascending=False).head(10).to_dict()}
+        {df[SDG_NAMES].sum().sort_values(ascending=False).head(10).to_string()}
         """
         
         # AI System Message
@@ -456,12 +576,12 @@ def perform_sdg_analysis(question: str, year_range: tuple, regions: List[str] =
         # Run AI analysis
         client = get_openai_client()
         if client:
-            response = run_analysis(system_msg, user_msg, model="model-router", client=client)
+            response = cached_sdg_answer(system_msg, user_msg, "model-router")
             st.markdown("### 🤖 AI Analysis Results")
             st.markdown(response)
         else:
             st.warning("AI client not available. Showing data summary instead.")
-            st.dataframe(df.groupby('year')[list(SDG_INFO.keys())].sum())
+            st.dataframe(df.groupby('year')[SDG_NAMES].sum())
     
     except Exception as e:
         st.error(f"Analysis error: {e}")
@@ -469,68 +589,95 @@ def perform_sdg_analysis(question: str, year_range: tuple, regions: List[str] =
         st.code(traceback.format_exc())
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_trend_figs(selected_sdgs: tuple, year_range: tuple, regions: tuple) -> Optional[Dict[str, Any]]:
+    """Trend and heatmap figures as Plotly JSON plus summary numbers, built once per filter set."""
+    df = _load_sdg_data(tuple(year_range), (), tuple(sorted(set(regions))))
+    
+    if df.empty:
+        return None
+    
+    selected_sdgs = list(selected_sdgs)
+    
+    # Aggregate by year
+    yearly_totals = _sum_sdg_counts(df, 'year', selected_sdgs, sort=True)
+    
+    # Create multi-line trend chart
+    years = yearly_totals.index.tolist()
+    counts = yearly_totals.to_numpy()
+    fig = go.Figure()
+    fig.add_traces([
+        go.Scatter(
+            x=years,
+            y=counts[:, i],
+            mode='lines+markers',
+            name=f"{SDG_INFO[sdg]['icon']} {sdg}",
+            line=dict(color=SDG_INFO[sdg]["color"], width=3),
+            marker=dict(size=10)
+        )
+        for i, sdg in enumerate(selected_sdgs)
+    ])
+    
+    fig.update_layout(
+        title="📈 SDG Trend Analysis Over Time",
+        xaxis_title="Year",
+        yaxis_title="Total Mentions",
+        hovermode='x unified',
+        height=600,
+        template="plotly_white"
+    )
+    
+    # Heatmap of SDG mentions by year
+    fig_heat = go.Figure(go.Heatmap(
+        z=counts.T,
+        x=years,
+        y=selected_sdgs,
+        colorscale="Viridis",
+        colorbar=dict(title="Mentions"),
+        hovertemplate="Year: %{x}<br>SDG: %{y}<br>Mentions: %{z}<extra></extra>"
+    ))
+    fig_heat.update_layout(
+        height=400,
+        xaxis_title="Year",
+        yaxis=dict(title="SDG", autorange="reversed")  # First SDG on top, as before
+    )
+    
+    sdg_totals = df[selected_sdgs].sum()
+    total_mentions = int(sdg_totals.sum())
+    
+    return {
+        'trend': fig.to_json(),
+        'heatmap': fig_heat.to_json(),
+        'total_mentions': total_mentions,
+        'avg_per_year': total_mentions / len(yearly_totals),
+        'top_sdg': sdg_totals.idxmax(),
+    }
+
+
 def create_sdg_trend_visualizations(selected_sdgs: List[str], year_range: tuple, regions: Optional[List[str]] = None):
     """Create advanced SDG trend visualizations."""
     try:
-        df = get_sdg_data(year_range, regions=regions)
+        figs = _build_trend_figs(tuple(selected_sdgs), tuple(year_range), tuple(regions or ()))
         
-        if df.empty:
+        if figs is None:
             st.warning("No data available for visualization.")
             return
         
-        # Aggregate by year
-        yearly_data = df.groupby('year')[selected_sdgs].sum().reset_index()
+        st.plotly_chart(pio.from_json(figs['trend']), use_container_width=True)
         
-        # Create multi-line trend chart
-        fig = go.Figure()
-        
-        for sdg in selected_sdgs:
-            color = SDG_INFO[sdg]["color"]
-            icon = SDG_INFO[sdg]["icon"]
-            fig.add_trace(go.Scatter(
-                x=yearly_data['year'],
-                y=yearly_data[sdg],
-                mode='lines+markers',
-                name=f"{icon} {sdg}",
-                line=dict(color=color, width=3),
-                marker=dict(size=10)
-            ))
-        
-        fig.update_layout(
-            title="📈 SDG Trend Analysis Over Time",
-            xaxis_title="Year",
-            yaxis_title="Total Mentions",
-            hovermode='x unified',
-            height=600,
-            template="plotly_white"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Heatmap of SDG mentions by year
         st.subheader("🔥 SDG Heatmap by Year")
-        heatmap_data = df.groupby('year')[selected_sdgs].sum().T
-        fig_heat = px.imshow(
-            heatmap_data,
-            labels=dict(x="Year", y="SDG", color="Mentions"),
-            color_continuous_scale="Viridis",
-            aspect="auto"
-        )
-        fig_heat.update_layout(height=400)
-        st.plotly_chart(fig_heat, use_container_width=True)
+        st.plotly_chart(pio.from_json(figs['heatmap']), use_container_width=True)
         
         # Summary statistics
         st.subheader("📊 Summary Statistics")
         col1, col2, col3 = st.columns(3)
         
-        total_mentions = df[selected_sdgs].sum().sum()
-        avg_per_year = total_mentions / len(yearly_data)
-        top_sdg = df[selected_sdgs].sum().idxmax()
+        top_sdg = figs['top_sdg']
         
         with col1:
-            st.metric("Total Mentions", f"{total_mentions:,}")
+            st.metric("Total Mentions", f"{figs['total_mentions']:,}")
         with col2:
-            st.metric("Avg per Year", f"{avg_per_year:.0f}")
+            st.metric("Avg per Year", f"{figs['avg_per_year']:.0f}")
         with col3:
             st.metric("Top SDG", top_sdg.split(':')[1] if ':' in top_sdg else top_sdg)
         
@@ -538,75 +685,99 @@ def create_sdg_trend_visualizations(selected_sdgs: List[str], year_range: tuple,
         st.error(f"Visualization error: {e}")
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_profile_figs(selected_countries: tuple, year_range: tuple) -> Optional[Dict[str, Any]]:
+    """Per-country top-5 bars and the comparison radar as Plotly JSON, built once per selection."""
+    df = _load_sdg_data(tuple(year_range), tuple(sorted(set(selected_countries))), ())
+    
+    if df.empty:
+        return None
+    
+    # Calculate SDG focus for each country
+    country_sdg_focus = _sum_sdg_counts(df, 'country', SDG_NAMES)
+    country_totals = country_sdg_focus.sum(axis=1)
+    country_percentages = (country_sdg_focus.div(country_totals, axis=0) * 100).round(2)
+    
+    # Rank every country's SDGs in one pass (stable, so ties keep SDG order)
+    top_sdg_positions = np.argsort(-country_sdg_focus.to_numpy(), axis=1, kind='stable')[:, :5]
+    
+    # Top 5 SDGs per country
+    bars = []
+    for country in selected_countries[:5]:  # Show first 5
+        if country in country_percentages.index:
+            row = country_percentages.index.get_loc(country)
+            top_sdgs = country_percentages.iloc[row, top_sdg_positions[row]]
+            
+            fig = go.Figure(data=[
+                go.Bar(
+                    x=top_sdgs.values,
+                    y=[
+                        f"{SDG_ICONS[i]} {SDG_NAMES[i].split(':')[1].strip()}"
+                        for i in top_sdg_positions[row]
+                    ],
+                    orientation='h',
+                    marker_color=[SDG_COLORS[i] for i in top_sdg_positions[row]]
+                )
+            ])
+            
+            fig.update_layout(
+                title=f"{country} - Top 5 SDG Focus (%)",
+                xaxis_title="Percentage of SDG Mentions",
+                height=300,
+                showlegend=False
+            )
+            
+            bars.append((country, fig.to_json()))
+    
+    # Comparison radar chart
+    radar = None
+    if len(selected_countries) >= 2:
+        # Select top SDGs for comparison
+        top_5_sdgs = country_sdg_focus.sum().nlargest(5).index.tolist()
+        
+        fig = go.Figure()
+        
+        for country in selected_countries[:3]:  # Max 3 for readability
+            if country in country_percentages.index:
+                values = country_percentages.loc[country, top_5_sdgs].values
+                fig.add_trace(go.Scatterpolar(
+                    r=list(values) + [values[0]],  # Close the radar
+                    theta=[sdg.split(':')[1].strip() for sdg in top_5_sdgs] + [top_5_sdgs[0].split(':')[1].strip()],
+                    fill='toself',
+                    name=country
+                ))
+        
+        fig.update_layout(
+            polar=dict(
+                radialaxis=dict(visible=True, range=[0, max(country_percentages[top_5_sdgs].max())])
+            ),
+            showlegend=True,
+            title="SDG Focus Comparison (Radar Chart)"
+        )
+        
+        radar = fig.to_json()
+    
+    return {'bars': bars, 'radar': radar}
+
+
 def create_country_sdg_profiles(selected_countries: List[str], year_range: tuple):
     """Create country-specific SDG profiles."""
     try:
-        df = get_sdg_data(year_range, countries=selected_countries)
+        figs = _build_profile_figs(tuple(selected_countries), tuple(year_range))
         
-        if df.empty:
+        if figs is None:
             st.warning("No data available for selected countries.")
             return
         
-        # Calculate SDG focus for each country
-        country_sdg_focus = df.groupby('country')[list(SDG_INFO.keys())].sum()
-        country_totals = country_sdg_focus.sum(axis=1)
-        country_percentages = (country_sdg_focus.div(country_totals, axis=0) * 100).round(2)
-        
-        # Top 5 SDGs per country
         st.subheader("🏆 Top 5 SDGs by Country")
         
-        for country in selected_countries[:5]:  # Show first 5
-            if country in country_percentages.index:
-                top_sdgs = country_percentages.loc[country].nlargest(5)
-                
-                st.markdown(f"#### {country}")
-                
-                fig = go.Figure(data=[
-                    go.Bar(
-                        x=top_sdgs.values,
-                        y=[f"{SDG_INFO[sdg]['icon']} {sdg.split(':')[1].strip()}" for sdg in top_sdgs.index],
-                        orientation='h',
-                        marker_color=[SDG_INFO[sdg]['color'] for sdg in top_sdgs.index]
-                    )
-                ])
-                
-                fig.update_layout(
-                    title=f"{country} - Top 5 SDG Focus (%)",
-                    xaxis_title="Percentage of SDG Mentions",
-                    height=300,
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+        for country, fig_json in figs['bars']:
+            st.markdown(f"#### {country}")
+            st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
         
-        # Comparison radar chart
-        if len(selected_countries) >= 2:
+        if figs['radar'] is not None:
             st.subheader("🔍 SDG Focus Comparison")
-            
-            # Select top SDGs for comparison
-            top_5_sdgs = country_sdg_focus.sum().nlargest(5).index.tolist()
-            
-            fig = go.Figure()
-            
-            for country in selected_countries[:3]:  # Max 3 for readability
-                if country in country_percentages.index:
-                    values = country_percentages.loc[country, top_5_sdgs].values
-                    fig.add_trace(go.Scatterpolar(
-                        r=list(values) + [values[0]],  # Close the radar
-                        theta=[sdg.split(':')[1].strip() for sdg in top_5_sdgs] + [top_5_sdgs[0].split(':')[1].strip()],
-                        fill='toself',
-                        name=country
-                    ))
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(visible=True, range=[0, max(country_percentages[top_5_sdgs].max())])
-                ),
-                showlegend=True,
-                title="SDG Focus Comparison (Radar Chart)"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(pio.from_json(figs['radar']), use_container_width=True)
     
     except Exception as e:
         st.error(f"Profile generation error: {e}")
@@ -632,6 +803,10 @@ def perform_custom_sdg_analysis(prompt: str, year_range: tuple, model: str, regi
             st.warning("No data available for the selected filters.")
             return
 
+        sdg_totals = df[SDG_NAMES].sum().sort_values(ascending=False)
+        sdg_totals = sdg_totals[sdg_totals != 0]
+        region_totals = df.groupby('region', observed=True)[SDG_NAMES].sum()
+
         # Prepare comprehensive context
         context = f"""
         SDG Analysis Request: {prompt}
@@ -643,14 +818,14 @@ def perform_custom_sdg_analysis(prompt: str, year_range: tuple, model: str, regi
         - Regions Filtered: {merged_regions if merged_regions else 'All'}
         - Countries Filtered: {merged_countries if merged_countries else 'Derived from regions'}
         
-        SDG Statistics:
-        {df[list(SDG_INFO.keys())].sum().sort_values(ascending=False).to_dict()}
+        SDG Statistics (total mentions):
+        {_context_table(sdg_totals.to_frame('mentions'))}
         
-        Regional Breakdown:
-        {df.groupby('region')[list(SDG_INFO.keys())].sum().to_dict()}
+        Regional Breakdown (top regions by mentions):
+        {_context_table(region_totals.loc[region_totals.sum(axis=1).sort_values(ascending=False).index])}
         
-        Temporal Trends:
-        {df.groupby('year')[list(SDG_INFO.keys())].sum().tail(10).to_dict()}
+        Temporal Trends (last 10 years):
+        {_context_table(df.groupby('year')[SDG_NAMES].sum().sort_index().tail(10))}
         """
         
         system_msg = """You are an expert SDG policy analyst.
@@ -669,14 +844,14 @@ def perform_custom_sdg_analysis(prompt: str, year_range: tuple, model: str, regi
         client = get_openai_client()
         if client:
             with st.spinner("🤖 AI is analyzing SDG data..."):
-                response = run_analysis(system_msg, user_msg, model=model, client=client)
+                response = cached_sdg_answer(system_msg, user_msg, model)
             
             st.markdown("### 🤖 AI Analysis")
             st.markdown(response)
             
             # Add quick visualization
             st.markdown("### 📊 Quick Data Overview")
-            top_sdgs = df[list(SDG_INFO.keys())].sum().nlargest(10)
+            top_sdgs = df[SDG_NAMES].sum().nlargest(10)
             
             fig = px.bar(
                 x=top_sdgs.values,
@@ -6,22 +6,49 @@ Reusable UI components for the Streamlit application
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from ..data.cross_year_analysis import cross_year_manager
 
 
-def render_country_selection():
-    """Render country selection interface with all UN member countries."""
+# Options of the classification selector
+CLASSIFICATION_OPTIONS = (
+    "African Member State",
+    "Development Partner",
+    "Other"
+)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_data_summary() -> Dict[str, Any]:
+    """Speech statistics for the data availability panels, recomputed at most every 5 minutes."""
+    return cross_year_manager.get_data_summary()
+
+
+@lru_cache(maxsize=1)
+def _country_options() -> tuple:
+    """Sorted country names for the selector, built once rather than on every rerun."""
     # Get all countries from the mapping
     from ..data.data_ingestion import COUNTRY_CODE_MAPPING
     
-    # Create sorted list of country names
-    all_countries = sorted(COUNTRY_CODE_MAPPING.values())
+    # Add empty option at start
+    return ("",) + tuple(sorted(COUNTRY_CODE_MAPPING.values()))
+
+
+@lru_cache(maxsize=64)
+def _suggestion_questions(country: str, classification: str) -> tuple:
+    """Suggested questions for a country and classification, built once per pair."""
+    from ..utils.utils import get_suggestion_questions
     
+    return tuple(get_suggestion_questions(country, classification))
+
+
+def render_country_selection():
+    """Render country selection interface with all UN member countries."""
     # Country selection with searchable dropdown
     country = st.selectbox(
         "Country Name:",
-        options=[""] + all_countries,  # Add empty option at start
+        options=_country_options(),
         index=0,
         help="Select the country that delivered the speech"
     )
@@ -41,15 +68,14 @@ def render_speech_date_selection():
     return speech_date
 
 
-def render_classification_selection(country=None):
-    """Render classification selection interface."""
-    # Classification options
-    classification_options = [
-        "African Member State",
-        "Development Partner",
-        "Other"
-    ]
+def render_classification_selection(country=None, key=None):
+    """
+    Render classification selection interface.
     
+    With a key the selector keeps the user's choice across reruns (needed
+    inside a form) and only follows auto-detection while it still shows
+    the classification detected for the previous country.
+    """
     # Auto-detect if country is African
     default_index = 0
     if country:
@@ -61,10 +87,25 @@ def render_classification_selection(country=None):
         else:
             default_index = 1  # Development Partner
     
+    if key is None:
+        return st.selectbox(
+            "Select Classification:",
+            options=CLASSIFICATION_OPTIONS,
+            index=default_index,
+            help="Choose the appropriate classification for the country"
+        )
+    
+    detected = CLASSIFICATION_OPTIONS[default_index]
+    detected_key = f"{key}_detected"
+    previous = st.session_state.get(detected_key)
+    if key not in st.session_state or (previous != detected and st.session_state[key] == previous):
+        st.session_state[key] = detected
+    st.session_state[detected_key] = detected
+    
     classification = st.selectbox(
         "Select Classification:",
-        options=classification_options,
-        index=default_index,
+        options=CLASSIFICATION_OPTIONS,
+        key=key,
         help="Choose the appropriate classification for the country"
     )
     
@@ -104,7 +145,7 @@ def render_sidebar_metadata_section(uploaded_file=None, pasted_text=None):
     # Show current session info
     if uploaded_file:
         st.sidebar.info(f"📁 **File:** {uploaded_file.name}")
-        st.sidebar.info(f"📏 **Size:** {len(uploaded_file.getvalue()):,} bytes")
+        st.sidebar.info(f"📏 **Size:** {uploaded_file.size:,} bytes")
     
     if pasted_text:
         st.sidebar.info(f"📝 **Text Length:** {len(pasted_text):,} characters")
@@ -125,7 +166,7 @@ def render_data_availability_info():
     st.subheader("📊 Data Availability")
     
     # Get data summary
-    data_summary = cross_year_manager.get_data_summary()
+    data_summary = cached_data_summary()
     
     if data_summary:
         col1, col2, col3, col4 = st.columns(4)
@@ -147,13 +188,11 @@ def render_analysis_suggestions(country: str, classification: str):
     """Render analysis suggestions with clickable questions."""
     st.subheader("💡 Suggested Questions")
     
-    from ..utils.utils import get_suggestion_questions
-    suggestion_questions = get_suggestion_questions(country, classification)
+    suggestion_questions = _suggestion_questions(country, classification)
     
     if suggestion_questions:
         # Initialize selected question in session state
-        if 'selected_question' not in st.session_state:
-            st.session_state.selected_question = ""
+        st.session_state.setdefault('selected_question', "")
         
         # Show first few suggestions as clickable buttons
         st.markdown("**Click a question to load it:**")
@@ -178,17 +217,14 @@ def render_chat_interface(analysis_context: str, country: str, classification: s
     st.subheader("💬 Ask Follow-up Questions")
     
     # Initialize chat history if not exists
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    st.session_state.setdefault('chat_history', [])
     
     # Initialize selected question if not exists
-    if 'selected_question' not in st.session_state:
-        st.session_state.selected_question = ""
+    st.session_state.setdefault('selected_question', "")
     
     # Chat input - use selected question if available
     # Use a persistent key to maintain the text area value
-    if 'chat_input_value' not in st.session_state:
-        st.session_state.chat_input_value = ""
+    st.session_state.setdefault('chat_input_value', "")
     
     # If there's a selected question, update the input value
     if st.session_state.selected_question:
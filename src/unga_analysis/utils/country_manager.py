@@ -29,6 +29,10 @@ class CountryManager:
                     "SELECT DISTINCT country_name FROM speeches WHERE country_name IS NOT NULL ORDER BY country_name"
                 ).fetchall()
                 self._countries_cache = [row[0] for row in result]
+                if not self._countries_cache:
+                    # An empty database has no speeches to list countries from yet
+                    from src.unga_analysis.config.countries import get_all_countries
+                    self._countries_cache = get_all_countries()
             except Exception as e:
                 print(f"Error getting countries from database: {e}")
                 # Fallback to config if database fails
@@ -9,6 +9,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
@@ -539,17 +541,23 @@ class ImprovedVisualizationManager:
 
             from src.unga_analysis.data.data_ingestion import get_regions_for_code
 
-            df['regions'] = df['country_code'].apply(get_regions_for_code)
-            df['region'] = df['regions'].apply(lambda r: r[0] if r else 'Unknown')
-            df = df.drop(columns=['country_code'])
+            # Resolve regions once per country code rather than storing a list per row
+            code_regions = {code: get_regions_for_code(code) for code in df['country_code'].unique()}
+            df['region'] = df['country_code'].map(
+                {code: labels[0] if labels else 'Unknown' for code, labels in code_regions.items()}
+            )
 
             if regions:
-                df = df[df['regions'].apply(lambda region_list: any(region in regions for region in region_list))]
+                wanted_regions = set(regions)
+                matching_codes = {code for code, labels in code_regions.items() if wanted_regions.intersection(labels)}
+                df = df[df['country_code'].isin(matching_codes)]
                 if df.empty:
                     return pd.DataFrame()
+
+            df = df.drop(columns=['country_code'])
             
             # Calculate mentions per 1000 words
-            df['mentions_per_1000_words'] = df.apply(lambda row: self._count_topic_mentions(row['speech_text'], row['topic'], topic_keywords) / (row['word_count'] / 1000), axis=1)
+            df['mentions_per_1000_words'] = self._count_topic_mentions(df, topic_keywords) / (df['word_count'] / 1000)
             
             return df
             
@@ -748,12 +756,18 @@ class ImprovedVisualizationManager:
             logger.error(f"Error getting network data: {e}")
             return pd.DataFrame()
     
-    def _count_topic_mentions(self, text: str, topic: str, topic_keywords: Dict[str, List[str]]) -> int:
-        """Count mentions of a topic in text."""
-        if topic not in topic_keywords:
-            return 0
+    def _count_topic_mentions(self, df: pd.DataFrame, topic_keywords: Dict[str, List[str]]) -> np.ndarray:
+        """Count mentions of each row's topic in its speech text, using Arrow string kernels."""
+        texts_lower = pc.utf8_lower(pa.array(df['speech_text'], type=pa.string()))
+        topics = df['topic'].to_numpy()
+        mentions = np.zeros(len(df), dtype=np.int64)
+        
+        for topic, keywords in topic_keywords.items():
+            rows = np.flatnonzero(topics == topic)
+            if rows.size == 0:
+                continue
+            topic_texts = texts_lower.take(pa.array(rows))
+            for keyword in keywords:
+                mentions[rows] += pc.count_substring(topic_texts, keyword.lower()).to_numpy(zero_copy_only=False)
         
-        keywords = topic_keywords[topic]
-        text_lower = text.lower()
-        mentions = sum(text_lower.count(keyword.lower()) for keyword in keywords)
         return mentions
@@ -61,6 +61,12 @@ class StructuredFormatter(logging.Formatter):
         
         return json.dumps(log_entry, ensure_ascii=False)
 
+def shorten_error_message(error_message: str, limit: int = 100) -> str:
+    """Truncate an error message for display, appending an ellipsis if cut."""
+    if len(error_message) > limit:
+        return error_message[:limit] + "..."
+    return error_message
+
 class ErrorTracker:
     """Tracks and analyzes errors for better understanding."""
     
@@ -81,7 +87,8 @@ class ErrorTracker:
                 'last_seen': datetime.now().isoformat(),
                 'contexts': [],
                 'error_type': error_type,
-                'error_message': error_message
+                'error_message': error_message,
+                'short_message': shorten_error_message(error_message)
             }
         
         self.error_patterns[error_key]['count'] += 1
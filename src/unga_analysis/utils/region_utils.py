@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Iterable, List, Set, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 
 from src.unga_analysis.data.data_ingestion import (
     COUNTRY_CODE_MAPPING,
@@ -29,6 +30,36 @@ _COUNTRY_ALIASES: Dict[str, str] = {
 }
 
 
+# Region label -> member countries, built once from the country/region lookup
+_REGION_TO_COUNTRIES: Dict[str, FrozenSet[str]] = {}
+
+
+def _get_region_to_countries() -> Dict[str, FrozenSet[str]]:
+    """Return the inverted region -> countries mapping, building it on first use."""
+    global _REGION_TO_COUNTRIES
+
+    if _REGION_TO_COUNTRIES:
+        return _REGION_TO_COUNTRIES
+
+    members: Dict[str, Set[str]] = {}
+    for country, labels in get_country_region_lookup().items():
+        for label in labels:
+            members.setdefault(label, set()).add(country)
+
+    _REGION_TO_COUNTRIES = {label: frozenset(countries) for label, countries in members.items()}
+    return _REGION_TO_COUNTRIES
+
+
+@lru_cache(maxsize=256)
+def _expand_region_set(region_set: FrozenSet[str]) -> Tuple[str, ...]:
+    """Cached union of the member countries of the given regions."""
+    region_to_countries = _get_region_to_countries()
+    selected: Set[str] = set()
+    for region in region_set:
+        selected.update(region_to_countries.get(region, ()))
+    return tuple(sorted(selected))
+
+
 def _normalize(text: str) -> str:
     """Lowercase and strip punctuation for comparison."""
     text = text.lower()
@@ -39,18 +70,11 @@ def _normalize(text: str) -> str:
 
 def expand_regions_to_countries(regions: Iterable[str]) -> List[str]:
     """Return a sorted list of countries that belong to any of the provided regions."""
-    region_set = {region for region in regions if region}
+    region_set = frozenset(region for region in regions if region)
     if not region_set:
         return []
 
-    country_region_lookup = get_country_region_lookup()
-    selected: Set[str] = set()
-
-    for country, labels in country_region_lookup.items():
-        if any(region in labels for region in region_set):
-            selected.add(country)
-
-    return sorted(selected)
+    return list(_expand_region_set(region_set))
 
 
 def extract_regions_and_countries(text: str) -> Tuple[List[str], List[str]]:
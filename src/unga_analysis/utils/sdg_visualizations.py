@@ -14,6 +14,10 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import os
+import pyarrow.compute as pc
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -109,6 +113,40 @@ SDG_KEYWORDS = {
     }
 }
 
+# Speeches pulled from DuckDB per Arrow record batch
+SPEECH_BATCH_SIZE = 1024
+
+# One alternation per SDG, matched against lowercased speech text
+SDG_KEYWORD_PATTERNS = {
+    sdg: re.compile("|".join(re.escape(keyword.lower()) for keyword in info["keywords"]))
+    for sdg, info in SDG_KEYWORDS.items()
+}
+
+# Arrow's regex kernels release the GIL, so SDGs are matched on worker threads
+_MATCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(len(SDG_KEYWORDS), os.cpu_count() or 1),
+    thread_name_prefix="sdg-match",
+)
+
+
+def _match_sdgs(texts_lower, sdgs: List[str]) -> List[np.ndarray]:
+    """Boolean keyword-presence mask per SDG for one batch of lowercased speeches."""
+    def match(sdg: str) -> np.ndarray:
+        return pc.match_substring_regex(
+            texts_lower, SDG_KEYWORD_PATTERNS[sdg].pattern
+        ).to_numpy(zero_copy_only=False)
+    
+    return list(_MATCH_EXECUTOR.map(match, sdgs))
+
+
+def _add_year_counts(counts: Dict[int, int], years: np.ndarray, keys: Optional[np.ndarray] = None):
+    """Add per-year occurrence counts to ``counts``, registering every year in ``keys`` with zero."""
+    for year_val in np.unique(keys if keys is not None else years):
+        counts.setdefault(int(year_val), 0)
+    values, tallies = np.unique(years, return_counts=True)
+    for year_val, tally in zip(values, tallies):
+        counts[int(year_val)] += int(tally)
+
 
 def render_sdg_visualization_tab(db_manager):
     """Main SDG visualization interface."""
@@ -295,15 +333,14 @@ def _create_sdg_multi_line_chart(db_manager, selected_sdgs, year_range, entity_m
                     if not countries_in_region:
                         continue
                     
-                    placeholders = ','.join(['?' for _ in countries_in_region])
-                    query = f"""
+                    query = """
                         SELECT year, speech_text
                         FROM speeches
                         WHERE year >= ? AND year <= ?
                         AND speech_text IS NOT NULL
-                        AND country_name IN ({placeholders})
+                        AND list_contains(?::VARCHAR[], country_name)
                     """
-                    params = [year_range[0], year_range[1]] + countries_in_region
+                    params = [year_range[0], year_range[1], countries_in_region]
                 else:
                     # Specific country
                     query = """
@@ -315,33 +352,29 @@ def _create_sdg_multi_line_chart(db_manager, selected_sdgs, year_range, entity_m
                     """
                     params = [year_range[0], year_range[1], entity]
                 
-                speeches = db_manager.conn.execute(query, params).fetchall()
+                # Stream speeches as Arrow batches and match each SDG's
+                # keyword pattern over a whole batch at a time
+                reader = db_manager.conn.execute(query, params).fetch_record_batch(SPEECH_BATCH_SIZE)
+                
+                sdg_year_counts = {sdg: {} for sdg in selected_sdgs}
+                year_totals = {}
+                
+                for batch in reader:
+                    years = batch.column(0).to_numpy(zero_copy_only=False)
+                    texts_lower = pc.utf8_lower(batch.column(1))
+                    _add_year_counts(year_totals, years)
+                    
+                    # Check if any SDG keyword is in each speech
+                    for sdg, mentioned in zip(selected_sdgs, _match_sdgs(texts_lower, selected_sdgs)):
+                        _add_year_counts(sdg_year_counts[sdg], years[mentioned], keys=years)
                 
-                if not speeches:
+                if not year_totals:
                     continue
                 
-                # Calculate SDG mentions for each selected SDG
                 for sdg in selected_sdgs:
-                    sdg_keywords = SDG_KEYWORDS[sdg]["keywords"]
-                    
-                    year_counts = {}
-                    year_totals = {}
-                    
-                    for year_val, text in speeches:
-                        if year_val not in year_counts:
-                            year_counts[year_val] = 0
-                            year_totals[year_val] = 0
-                        
-                        year_totals[year_val] += 1
-                        
-                        # Check if any SDG keyword is in speech
-                        text_lower = text.lower()
-                        if any(keyword.lower() in text_lower for keyword in sdg_keywords):
-                            year_counts[year_val] += 1
-                    
                     entity_sdg_data[entity][sdg] = {
-                        'year_counts': year_counts,
-                        'year_totals': year_totals
+                        'year_counts': sdg_year_counts[sdg],
+                        'year_totals': dict(year_totals)
                     }
         
         # Create visualization based on number of SDGs
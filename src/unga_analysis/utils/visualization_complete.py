@@ -363,6 +363,10 @@ class UNGAVisualizationManager:
         years = list(range(year_range[0], year_range[1] + 1))
         topic_data = {topic: {year: 0 for year in years} for topic in topic_keywords.keys()}
         speeches_per_year = {year: 0 for year in years}
+        keywords_lower = {
+            topic: tuple(keyword.lower() for keyword in keywords)
+            for topic, keywords in topic_keywords.items()
+        }
         
         # Count speeches and topic mentions
         for speech in speeches:
@@ -370,8 +374,8 @@ class UNGAVisualizationManager:
             text_lower = speech['text'].lower()
             speeches_per_year[year] += 1
             
-            for topic, keywords in topic_keywords.items():
-                if any(keyword.lower() in text_lower for keyword in keywords):
+            for topic, keywords in keywords_lower.items():
+                if any(keyword in text_lower for keyword in keywords):
                     topic_data[topic][year] += 1
         
         # Convert to percentages
@@ -0,0 +1,71 @@
+"""
+Tests for splitting and translating speech text
+"""
+
+import time
+
+from src.unga_analysis.data import data_ingestion
+from src.unga_analysis.data.data_ingestion import split_into_translation_chunks, translate_chunks
+
+
+SENTENCES = [f"Sentence number {i} talks about development and peace." for i in range(40)]
+
+
+def test_chunks_respect_size_and_sentence_boundaries():
+    text = " ".join(SENTENCES)
+    chunks = split_into_translation_chunks(text, max_chunk_size=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    # Sentences stay whole and in order
+    assert " ".join(chunks) == text
+    for sentence in SENTENCES:
+        assert any(sentence in chunk for chunk in chunks)
+
+
+def test_chunks_pack_sentences_greedily():
+    text = "One. Two. Three."
+    assert split_into_translation_chunks(text, max_chunk_size=9) == ["One. Two.", "Three."]
+    assert split_into_translation_chunks(text, max_chunk_size=100) == [text]
+
+
+def test_overlong_sentence_is_sliced():
+    long_sentence = "x" * 249 + "."
+    chunks = split_into_translation_chunks(f"Short. {long_sentence} End.", max_chunk_size=100)
+
+    assert chunks == ["Short.", "x" * 100, "x" * 100, "x" * 49 + ".", "End."]
+
+
+def test_empty_text_has_no_chunks():
+    assert split_into_translation_chunks("") == []
+
+
+def test_translate_chunks_keeps_order(monkeypatch):
+    chunks = [f"chunk {i}" for i in range(6)]
+
+    def fake_translate(chunk, source_lang):
+        # Later chunks finish first
+        time.sleep((len(chunks) - int(chunk.split()[1])) * 0.01)
+        return chunk.upper()
+
+    monkeypatch.setattr(data_ingestion, "_translate_chunk", fake_translate)
+    progress = []
+    translated = translate_chunks(chunks, "fr", on_progress=lambda done, total: progress.append((done, total)))
+
+    assert translated == [chunk.upper() for chunk in chunks]
+    assert progress == [(done, len(chunks)) for done in range(1, len(chunks) + 1)]
+
+
+def test_translate_no_chunks():
+    assert translate_chunks([], "fr") == []
+
+
+def test_region_lookups_return_fresh_lists():
+    code = next(iter(data_ingestion.REGION_MAPPING))
+    regions = data_ingestion.get_regions_for_code(code)
+    regions.append("Mutated")
+    additional = data_ingestion.get_additional_region_groupings_for_code(code)
+    additional.append("Mutated")
+
+    assert "Mutated" not in data_ingestion.get_regions_for_code(code)
+    assert "Mutated" not in data_ingestion.get_additional_region_groupings_for_code(code)
@@ -0,0 +1,55 @@
+"""
+Tests for the document context analysis helpers
+"""
+
+from src.unga_analysis.ui.tabs.document_context_analysis_tab import (
+    analysis_cache_key,
+    build_historical_context,
+    build_search_query_text,
+)
+
+
+BASE = dict(combined_text="--- a.pdf ---\n\nText", additional_context="", year_range=(2000, 2024),
+            model="gpt-4o", analysis_depth="Deep", max_context_speeches=10)
+
+
+def test_analysis_cache_key_is_stable():
+    assert analysis_cache_key(**BASE) == analysis_cache_key(**BASE)
+
+
+def test_analysis_cache_key_covers_every_setting():
+    changes = {
+        "combined_text": "--- b.pdf ---\n\nText",
+        "additional_context": "Context",
+        "year_range": (1990, 2024),
+        "model": "gpt-4o-mini",
+        "analysis_depth": "Quick",
+        "max_context_speeches": 20,
+    }
+    base_key = analysis_cache_key(**BASE)
+    for field, value in changes.items():
+        assert analysis_cache_key(**{**BASE, field: value}) != base_key, field
+
+
+def test_analysis_cache_key_separates_fields():
+    # Moving text between fields must not produce the same key
+    first = analysis_cache_key(**{**BASE, "additional_context": "ab", "model": "c"})
+    second = analysis_cache_key(**{**BASE, "additional_context": "a", "model": "bc"})
+    assert first != second
+
+
+def test_search_query_text_takes_each_document_opening():
+    query = build_search_query_text(["a" * 100, "b" * 100], max_chars=40)
+    assert query == "a" * 20 + "\n\n" + "b" * 18
+    assert build_search_query_text([]) == ""
+
+
+def test_historical_context_scores():
+    context = build_historical_context([
+        {"country_name": "Kenya", "year": 2015, "similarity": 0.8123},
+        {"country_name": "France", "year": 2016, "rrf_score": 0.0164},
+        {"country_name": "Ghana", "year": 2017},
+    ])
+    assert "**Similarity Score:** 0.812" in context
+    assert "**Relevance Score:** 0.0164" in context
+    assert context.count("Score:") == 2
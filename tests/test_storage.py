@@ -0,0 +1,287 @@
+"""
+Tests for the DuckDB speech storage
+"""
+
+import threading
+
+import duckdb
+import pytest
+
+from src.unga_analysis.data.simple_vector_storage import SimpleVectorStorageManager, text_sha256
+
+
+# Schema of a database created before the dedup columns and indexes existed
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE speeches (
+        id INTEGER PRIMARY KEY,
+        country_code VARCHAR(3) NOT NULL,
+        country_name VARCHAR(255) NOT NULL,
+        region VARCHAR(100) NOT NULL,
+        session INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        speech_text TEXT NOT NULL,
+        word_count INTEGER,
+        embedding FLOAT[384],
+        metadata JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_african_member BOOLEAN DEFAULT FALSE,
+        source_filename VARCHAR(255)
+    )
+    """,
+    """
+    CREATE TABLE analyses (
+        id INTEGER PRIMARY KEY,
+        country VARCHAR(255) NOT NULL,
+        classification VARCHAR(50) NOT NULL,
+        speech_date VARCHAR(50),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        sdgs VARCHAR(255),
+        africa_mentioned BOOLEAN DEFAULT FALSE,
+        source_filename VARCHAR(255),
+        raw_text TEXT,
+        prompt_used TEXT,
+        output_markdown TEXT,
+        metadata JSON,
+        chat_history JSON
+    )
+    """,
+    "CREATE INDEX idx_speeches_country_name ON speeches(country_name)",
+    "CREATE INDEX idx_speeches_year ON speeches(year)",
+]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """A storage manager on a fresh database file."""
+    manager = SimpleVectorStorageManager(str(tmp_path / "speeches.db"))
+    yield manager
+    manager.conn.close()
+
+
+@pytest.fixture
+def baseline_db(tmp_path):
+    """Path of a database laid out with the baseline schema and one legacy speech."""
+    db_path = str(tmp_path / "baseline.db")
+    conn = duckdb.connect(db_path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.execute(
+        "INSERT INTO speeches (id, country_code, country_name, region, session, year, speech_text) "
+        "VALUES (1, 'KEN', 'Kenya', 'Africa', 70, 2015, 'We will end poverty.')"
+    )
+    conn.close()
+    return db_path
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info('{table}')").fetchall()}
+
+
+def _speech_id_by_hash(conn, content_hash):
+    row = conn.execute("SELECT id FROM speeches WHERE text_sha256 = ?", [content_hash]).fetchone()
+    return row[0] if row else None
+
+
+def _indexes(conn):
+    return {row[0] for row in conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+
+
+def test_existing_database_is_migrated_on_open(baseline_db):
+    manager = SimpleVectorStorageManager(baseline_db)
+    try:
+        assert "text_sha256" in _columns(manager.conn, "speeches")
+        assert {"model", "text_sha256"} <= _columns(manager.conn, "analyses")
+
+        assert _speech_id_by_hash(manager.conn, text_sha256("We will end poverty.")) == 1
+
+        speech_id = manager.save_speech("FRA", "France", "Europe", 70, 2015, "Climate action now.")
+        assert speech_id
+        assert _speech_id_by_hash(manager.conn, text_sha256("Climate action now.")) == speech_id
+    finally:
+        manager.conn.close()
+
+
+@pytest.mark.parametrize("text", [
+    "We will end poverty.",
+    " We will end poverty.\n",
+    "\vWe will end poverty.",
+    "\xa0We will end poverty.\u3000",
+    "\u2028We will end poverty.\x1c",
+])
+def test_backfilled_hash_matches_text_sha256(tmp_path, text):
+    db_path = str(tmp_path / "legacy.db")
+    conn = duckdb.connect(db_path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.execute(
+        "INSERT INTO speeches (id, country_code, country_name, region, session, year, speech_text) "
+        "VALUES (1, 'KEN', 'Kenya', 'Africa', 70, 2015, ?)",
+        [text],
+    )
+    conn.close()
+
+    manager = SimpleVectorStorageManager(db_path)
+    try:
+        assert _speech_id_by_hash(manager.conn, text_sha256(text)) == 1
+    finally:
+        manager.conn.close()
+
+
+def test_legacy_analysis_is_found_after_migration(baseline_db):
+    conn = duckdb.connect(baseline_db)
+    conn.execute(
+        "INSERT INTO analyses (id, country, classification, raw_text, output_markdown, metadata) "
+        "VALUES (1, 'Kenya', 'African Member State', ' We will end poverty.\n', '# Report', ?)",
+        ['{"model": "gpt-4o"}'],
+    )
+    conn.close()
+
+    manager = SimpleVectorStorageManager(baseline_db)
+    try:
+        assert "idx_analyses_dedup" in _indexes(manager.conn)
+
+        cached = manager.find_analysis(text_sha256("We will end poverty."), "gpt-4o", "African Member State")
+        assert cached["id"] == 1
+        assert cached["output_markdown"] == "# Report"
+        assert manager.find_analysis(text_sha256("We will end poverty."), "gpt-5", "African Member State") is None
+
+        analysis_id = manager.save_analysis(
+            "France", "Development Partner", "Climate action now.", "# France", "prompt", model="gpt-4o"
+        )
+        cached = manager.find_analysis(text_sha256("Climate action now."), "gpt-4o", "Development Partner")
+        assert cached["id"] == analysis_id
+    finally:
+        manager.conn.close()
+
+
+def test_speech_indexes_are_created_on_open(storage, baseline_db):
+    expected = {"idx_speeches_country_name", "idx_speeches_year", "idx_speeches_text_sha256", "idx_speeches_country_year"}
+    assert expected <= _indexes(storage.conn)
+
+    manager = SimpleVectorStorageManager(baseline_db)
+    try:
+        assert expected <= _indexes(manager.conn)
+    finally:
+        manager.conn.close()
+
+    # Opening the database again leaves the existing indexes in place
+    manager = SimpleVectorStorageManager(baseline_db)
+    try:
+        assert expected <= _indexes(manager.conn)
+    finally:
+        manager.conn.close()
+
+
+def test_text_sha256_ignores_surrounding_whitespace():
+    assert text_sha256("  Peace and security.\n") == text_sha256("Peace and security.")
+    assert text_sha256("Peace and security.") != text_sha256("Peace and  security.")
+    assert len(text_sha256("")) == 64
+
+
+def _speech_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM speeches").fetchone()[0]
+
+
+def test_transaction_commits_grouped_saves(storage):
+    with storage.transaction():
+        storage.save_speech("KEN", "Kenya", "Africa", 70, 2015, "We will end poverty.")
+        storage.save_speech("FRA", "France", "Europe", 70, 2015, "Climate action now.")
+
+    assert _speech_count(storage.conn) == 2
+
+
+def test_transaction_rolls_back_on_error(storage):
+    storage.save_speech("KEN", "Kenya", "Africa", 70, 2015, "We will end poverty.")
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.save_speech("FRA", "France", "Europe", 70, 2015, "Climate action now.")
+            with storage.transaction():
+                storage.save_speech("GHA", "Ghana", "Africa", 70, 2015, "Trade not aid.")
+            raise RuntimeError("abort")
+
+    assert _speech_count(storage.conn) == 1
+    assert not storage._in_transaction
+
+    # Later saves commit on their own again
+    storage.save_speech("FRA", "France", "Europe", 70, 2015, "Climate action now.")
+    assert _speech_count(storage.conn) == 2
+
+
+def test_other_thread_does_not_join_a_transaction(storage):
+    started = threading.Event()
+    saved = []
+
+    def save_from_other_session():
+        started.set()
+        saved.append(storage.save_speech("GHA", "Ghana", "Africa", 70, 2015, "Trade not aid."))
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.save_speech("FRA", "France", "Europe", 70, 2015, "Climate action now.")
+            other = threading.Thread(target=save_from_other_session)
+            other.start()
+            started.wait()
+            other.join(timeout=0.2)
+            # The other session's save waits for this transaction to end
+            assert other.is_alive()
+            raise RuntimeError("abort")
+
+    other.join()
+    assert saved
+    assert _speech_count(storage.conn) == 1
+    assert _speech_id_by_hash(storage.conn, text_sha256("Trade not aid.")) == saved[0]
+
+
+def test_hybrid_search_fuses_rankings(storage, monkeypatch):
+    keyword = [{"id": 1, "bm25_score": 9.0}, {"id": 2, "bm25_score": 5.0}, {"id": 3, "bm25_score": 1.0}]
+    semantic = [{"id": 3, "similarity": 0.9}, {"id": 1, "similarity": 0.8}, {"id": 4, "similarity": 0.7}]
+    queries = {}
+
+    def fake_keyword_search(query_text, **kwargs):
+        queries["keyword"] = query_text
+        return keyword
+
+    def fake_semantic_search(query_text, **kwargs):
+        queries["semantic"] = query_text
+        return semantic
+
+    monkeypatch.setattr(storage, "keyword_search", fake_keyword_search)
+    monkeypatch.setattr(storage, "semantic_search", fake_semantic_search)
+
+    results = storage.hybrid_search("long document window", limit=3, keyword_query="poverty")
+
+    # Speeches in both rankings come first, ordered by summed 1 / (RRF_K + rank)
+    assert [speech["id"] for speech in results] == [1, 3, 2]
+    assert results[0]["rrf_score"] == pytest.approx(1 / 61 + 1 / 62)
+    assert results[1]["rrf_score"] == pytest.approx(1 / 63 + 1 / 61)
+    assert results[2]["rrf_score"] == pytest.approx(1 / 62)
+    # Fields from both rankings are merged
+    assert results[0]["bm25_score"] == 9.0 and results[0]["similarity"] == 0.8
+    assert "similarity" not in results[2]
+    assert queries == {"keyword": "poverty", "semantic": "long document window"}
+
+
+def test_query_embedding_cache_stays_bounded_across_threads(storage, monkeypatch):
+    from src.unga_analysis.data import simple_vector_storage as storage_module
+
+    monkeypatch.setattr(storage_module, "QUERY_EMBEDDING_CACHE_SIZE", 8)
+    errors = []
+
+    def embed_many(offset):
+        try:
+            for i in range(200):
+                storage.get_query_embedding(f"query {(offset + i) % 20}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=embed_many, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(storage._query_embedding_cache) <= 8
+    assert storage.get_query_embedding("query 3") == storage.generate_embedding("query 3")